@@ -3,15 +3,38 @@ Purpose:
     This file contains the class for Algorithm
 """
 
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+from .cache import MISSING, ResultCache
+from .function import Function, FunctionError
+from .instrumentation import Instrumentation, ScoringHook
+from .score_matrix import ScoreMatrix
+from .scoring_report import ScoringReport
 from .weighted_function import WeightedFunction
-import pickle
+from contextlib import nullcontext
+import asyncio
+import heapq
+import itertools
+import time
+from . import artifact
+from . import catalog
+from . import compiled
+from . import features
+from . import parallel
 from . import utils
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Algorithm:
-    def __init__(self, name: str, desc: str, functions: List[WeightedFunction]):
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        functions: List[WeightedFunction],
+        cache_size: int = 4096,
+    ):
         """
         Purpose:
             Init Algorithm Class
@@ -19,6 +42,7 @@ class Algorithm:
             name: Name of function
             desc: description of function
             functions: list of functions for the Algorithm
+            cache_size: number of deterministic Function results to cache
         Returns:
             Algorithm class
         """
@@ -26,7 +50,77 @@ class Algorithm:
         self.name = name
         self.desc = desc
         self.functions = functions
-        
+        self.cache = ResultCache(cache_size)
+        self.instrumentation = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Cached results and instrumentation are not saved with the algo
+        state = self.__dict__.copy()
+        state.pop("instrumentation", None)
+        cache = state.pop("cache", None)
+        state["cache_size"] = cache.max_size if cache else 4096
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Algorithms pickled before the cache existed get the default size
+        cache_size = state.pop("cache_size", 4096)
+        self.__dict__.update(state)
+        self.cache = ResultCache(cache_size)
+        self.instrumentation = None
+
+    def get_cache(self) -> ResultCache:
+        """
+        Purpose:
+            Get the cache of deterministic Function results
+        Args:
+            N/A
+        Returns:
+            cache: the ResultCache, with hit/miss/eviction counters
+        """
+        return self.cache
+
+    def enable_instrumentation(
+        self, hooks: List[ScoringHook] = None
+    ) -> Instrumentation:
+        """
+        Purpose:
+            Start timing every weighted function call. Not carried into the
+            workers of the process pool mode
+        Args:
+            hooks: ScoringHooks to call at the start and end of each call
+        Returns:
+            instrumentation: the counters, see Instrumentation.summary
+        """
+        self.instrumentation = Instrumentation(hooks)
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """
+        Purpose:
+            Stop timing the weighted function calls
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self.instrumentation = None
+
+    def with_instrumentation(self, hooks: List[ScoringHook] = None) -> "Algorithm":
+        """
+        Purpose:
+            Get a copy of the algo with its own instrumentation, so callers
+            sharing this algo, e.g. a cached one, do not time each other
+        Args:
+            hooks: ScoringHooks to call at the start and end of each call
+        Returns:
+            algo: copy sharing the functions and cache, with instrumentation on
+        """
+        # Not copy.copy, __getstate__ would leave the copy a new cache
+        algo = object.__new__(type(self))
+        algo.__dict__.update(self.__dict__)
+        algo.enable_instrumentation(hooks)
+        return algo
+
     # TODO do we need this function?
     def run_algo(self, tweet: Dict[str, Any]) -> int:
         """
@@ -38,6 +132,7 @@ class Algorithm:
             result: The rating of your tweet
         """
         result = 0
+        tweet = self._share_features([tweet])[0]
         try:
 
             for func in self.functions:
@@ -50,83 +145,879 @@ class Algorithm:
     def save_algo(self, folder="saved_algos"):
         """
         Purpose:
-            Save the algo
+            Save the algo as a versioned artifact, see artifact.py, and add
+            it to the folder's catalog
         Args:
             folder: folder to save data
         Returns:
-            result: The rating of your tweet
+            N/A
         """
 
         algo_file = f"{folder}/{self.name}.algo"
         algo_json_file = f"{folder}/{self.name}.json"
 
-        # create a pickle file
-        picklefile = open(algo_file, "wb")
-        # pickle the algo and write it to file
-        pickle.dump(self, picklefile)
-        # close the file
-        picklefile.close()
+        artifact.save_artifact(self, algo_file)
 
         algo_json = {"name": self.name, "desc": self.desc, "algo_path": algo_file}
 
         utils.save_json(algo_json_file, algo_json)
+        catalog.register_algo(folder, algo_json)
 
+    def compile(self) -> "compiled.CompiledAlgorithm":
+        """
+        Purpose:
+            Generate one scoring function for the algo, with the weights
+            inlined and one check per function output. Compile again after
+            changing the algo
+        Args:
+            N/A
+        Returns:
+            compiled_algo: CompiledAlgorithm with score_columns and
+                process_tweets like this class
+        """
+        return compiled.CompiledAlgorithm(self)
 
-    def process_tweets(self, tweets: List[Dict[str, Any]]) -> pd.DataFrame:
+    def score_columns(self, tweets: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
         """
         Purpose:
-            Run the algorithm on the tweets
+            Run all the functions in the algorithm on the tweets
         Args:
             tweets - List of tweets
         Returns:
-            algo_tweets - sorted tweets based on algo
+            columns - weighted scores per function name, plus the algo_score
         """
 
-        tweet_values_list = []
+        columns = {}
+        raw_values = {}  # deterministic results by function key
+        algo_score = np.zeros(len(tweets))  # The score for the algo
+        tweets = self._share_features(tweets)
+
+        # Run all the functions in the algorithm, one call per function
+        for func in self.functions:
+            with self._measure(func, len(tweets)):
+                values = self._run_function(func, tweets, raw_values)
+
+            curr_values = values * func.weight
+            columns[func.get_name()] = curr_values  # store values
+
+            # Add to final score
+            algo_score = algo_score + curr_values
+
+        columns["algo_score"] = algo_score
 
-        for tweet in tweets:
-            tweet_values_json = {}
-            algo_score = 0  # The score for the algo
+        return columns
+
+    def score_matrix(self, tweets: List[Dict[str, Any]]) -> ScoreMatrix:
+        """
+        Purpose:
+            Run all the functions in the algorithm on the tweets and keep
+            the unweighted scores, to re-rank with new weights later
+        Args:
+            tweets - List of tweets
+        Returns:
+            score_matrix - ScoreMatrix with one row per tweet and one column
+                per weighted function
+        """
+
+        raw_values = {}  # deterministic results by function key
+        matrix = np.empty((len(tweets), len(self.functions)))
+        tweets = self._share_features(tweets)
+
+        for position, func in enumerate(self.functions):
+            with self._measure(func, len(tweets)):
+                matrix[:, position] = self._run_function(func, tweets, raw_values)
+
+        return ScoreMatrix(
+            [func.get_name() for func in self.functions],
+            [func.weight for func in self.functions],
+            matrix,
+            [tweet["twitter_url"] for tweet in tweets],
+        )
+
+    async def score_columns_async(
+        self, tweets: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Purpose:
+            Run all the functions in the algorithm on the tweets, async
+            functions concurrently with each other and across tweets. Sync
+            functions run inline while the async calls are in flight
+        Args:
+            tweets - List of tweets
+        Returns:
+            columns - weighted scores per function name, plus the algo_score
+        """
+
+        values = {}
+        raw_values = {}  # deterministic sync results by function key
+        raw_tasks = {}  # deterministic async runs by function key
+        tasks = {}
+        tweets = self._share_features(tweets)
+
+        for func in self.functions:
+            if func.func.is_async:
+                tasks[func.get_name()] = asyncio.ensure_future(
+                    self._run_function_async(func, tweets, raw_tasks)
+                )
+
+        try:
+            # Let the async functions send their first calls
+            await asyncio.sleep(0)
 
-            # Run all the functions in the algorithm
             for func in self.functions:
-                # print(func.get_name())
+                if not func.func.is_async:
+                    with self._measure(func, len(tweets)):
+                        values[func.get_name()] = self._run_function(
+                            func, tweets, raw_values
+                        )
+
+            results = await asyncio.gather(*tasks.values())
+        finally:
+            # Stop the other functions once one fails
+            for task in itertools.chain(tasks.values(), raw_tasks.values()):
+                task.cancel()
+
+        values.update(zip(tasks.keys(), results))
+
+        columns = {}
+        algo_score = np.zeros(len(tweets))  # The score for the algo
 
-                curr_value = func.run_code(tweet)  # Run the code on the tweet
-                tweet_values_json[func.get_name()] = curr_value  # store value
+        # Add up in function order, so the scores match score_columns
+        for func in self.functions:
+            curr_values = values[func.get_name()] * func.weight
+            columns[func.get_name()] = curr_values  # store values
 
-                # Add to final score
-                algo_score += curr_value
+            # Add to final score
+            algo_score = algo_score + curr_values
 
-            tweet_values_json["algo_score"] = algo_score
-            tweet_values_json["twitter_url"] = tweet["twitter_url"]
+        columns["algo_score"] = algo_score
 
-            # Add to list
-            tweet_values_list.append(tweet_values_json)
+        return columns
 
-        # Turn list to df
-        df = pd.json_normalize(tweet_values_list)
+    async def _run_function_async(
+        self,
+        func: WeightedFunction,
+        tweets: List[Dict[str, Any]],
+        raw_tasks: Dict[str, "asyncio.Future"],
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Async version of _run_function for functions with async code
+        Args:
+            func - the WeightedFunction
+            tweets - List of tweets
+            raw_tasks - deterministic runs by function key, shared across
+                the weighted functions of one batch
+        Returns:
+            results - unweighted scores, one per tweet
+        """
+
+        with self._measure(func, len(tweets)):
+            if not func.func.deterministic:
+                return await func.func.run_batch_async(tweets)
+
+            # Same code under several weights only runs once
+            key = func.func.get_key()
+            if key not in raw_tasks:
+                raw_tasks[key] = asyncio.ensure_future(
+                    self._run_cached_async(func.func, key, tweets)
+                )
+
+            return await asyncio.shield(raw_tasks[key])
+
+    def _share_features(self, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Wrap a batch so functions that use features share one
+            TweetFeatures per tweet
+        Args:
+            tweets - List of tweets
+        Returns:
+            tweets - a FeatureList if any function uses features, else the
+                same list
+        """
+
+        if any(func.func.uses_features for func in self.functions):
+            return features.share_features(tweets)
+
+        return tweets
+
+    def _measure(self, func: WeightedFunction, num_tweets: int):
+        """
+        Purpose:
+            Get the context that times a weighted function call
+        Args:
+            func - the WeightedFunction
+            num_tweets - number of tweets in the call
+        Returns:
+            context manager, does nothing if instrumentation is off
+        """
+        if self.instrumentation:
+            return self.instrumentation.measure(func.get_name(), num_tweets)
+
+        return nullcontext()
+
+    def _run_function(
+        self,
+        func: WeightedFunction,
+        tweets: List[Dict[str, Any]],
+        raw_values: Dict[str, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Run the code of a weighted function on the tweets
+        Args:
+            func - the WeightedFunction
+            tweets - List of tweets
+            raw_values - deterministic results by function key, shared
+                across the weighted functions of one batch
+        Returns:
+            results - unweighted scores, one per tweet
+        """
+
+        if not func.func.deterministic:
+            return func.func.run_batch(tweets)  # Run the code on the tweets
+
+        # Same code under several weights only runs once
+        key = func.func.get_key()
+        if key not in raw_values:
+            raw_values[key] = self._run_cached(func.func, key, tweets)
+
+        return raw_values[key]
+
+    def _run_cached(
+        self, function: Function, key: str, tweets: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Run a deterministic function, only on tweets not already cached
+        Args:
+            function - the deterministic Function
+            key - the function key
+            tweets - List of tweets
+        Returns:
+            results - unweighted scores, one per tweet
+        """
+
+        results, missing = self._cache_lookup(key, tweets)
+
+        if not missing:
+            return results
+
+        missing_tweets = [tweets[index] for index in missing]
+
+        try:
+            missing_results = function.run_batch(missing_tweets)
+        except FunctionError as error:
+            if error.index is not None:
+                error.index = missing[error.index]
+            raise
+
+        self._cache_store(key, tweets, results, missing, missing_results)
+
+        return results
+
+    async def _run_cached_async(
+        self, function: Function, key: str, tweets: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Async version of _run_cached
+        Args:
+            function - the deterministic Function
+            key - the function key
+            tweets - List of tweets
+        Returns:
+            results - unweighted scores, one per tweet
+        """
+
+        results, missing = self._cache_lookup(key, tweets)
+
+        if not missing:
+            return results
+
+        missing_tweets = [tweets[index] for index in missing]
+
+        try:
+            missing_results = await function.run_batch_async(missing_tweets)
+        except FunctionError as error:
+            if error.index is not None:
+                error.index = missing[error.index]
+            raise
+
+        self._cache_store(key, tweets, results, missing, missing_results)
+
+        return results
+
+    def _cache_lookup(
+        self, key: str, tweets: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, List[int]]:
+        """
+        Purpose:
+            Get the cached results of a deterministic function
+        Args:
+            key - the function key
+            tweets - List of tweets
+        Returns:
+            (results, missing) - scores with the cached ones filled in, and
+                positions of tweets to run the function on
+        """
+
+        cache = self.get_cache()
+        results = np.empty(len(tweets))
+        missing = []
+
+        for index, tweet in enumerate(tweets):
+            id_str = tweet.get("id_str")
+            result = MISSING if id_str is None else cache.get((id_str, key))
+
+            if result is MISSING:
+                missing.append(index)
+            else:
+                results[index] = result
+
+        return results, missing
+
+    def _cache_store(
+        self,
+        key: str,
+        tweets: List[Dict[str, Any]],
+        results: np.ndarray,
+        missing: List[int],
+        missing_results: np.ndarray,
+    ) -> None:
+        """
+        Purpose:
+            Fill in and cache the results of the tweets that were run
+        Args:
+            key - the function key
+            tweets - List of tweets
+            results - scores from _cache_lookup, updated in place
+            missing - positions of the tweets that were run
+            missing_results - scores of the tweets that were run
+        Returns:
+            N/A
+        """
+
+        cache = self.get_cache()
+        results[missing] = missing_results
+
+        for index, result in zip(missing, missing_results.tolist()):
+            id_str = tweets[index].get("id_str")
+            if id_str is not None:
+                cache.put((id_str, key), result)
+
+    def _run_isolated(
+        self,
+        func: WeightedFunction,
+        tweets: List[Dict[str, Any]],
+        fallback_score: float,
+    ) -> Tuple[np.ndarray, List[Tuple[int, str]]]:
+        """
+        Purpose:
+            Run a weighted function one tweet at a time, so one bad tweet
+            does not lose the scores of the others
+        Args:
+            func - the WeightedFunction
+            tweets - List of tweets
+            fallback_score - unweighted score for tweets that fail
+        Returns:
+            (results, failed) - unweighted scores, and (index, error) per failure
+        """
 
-        # Sort df
-        sorted_df = df.sort_values(by=["algo_score"], ascending=False)
+        results = np.empty(len(tweets))
+        failed = []
+
+        for index, tweet in enumerate(tweets):
+            try:
+                results[index] = self._run_function(func, [tweet], {})[0]
+            except Exception as error:
+                results[index] = fallback_score
+                failed.append((index, str(error)))
+
+        return results, failed
+
+    def _run_per_tweet(
+        self,
+        func: WeightedFunction,
+        tweets: List[Dict[str, Any]],
+        fallback_score: float,
+    ) -> Tuple[np.ndarray, List[Tuple[int, str]]]:
+        """
+        Purpose:
+            Run a weighted function without batch code once per tweet,
+            keeping the scores that worked and caching them
+        Args:
+            func - the WeightedFunction
+            tweets - List of tweets
+            fallback_score - unweighted score for tweets that fail
+        Returns:
+            (results, failed) - unweighted scores, and (index, error) per failure
+        """
+
+        function = func.func
+        key = function.get_key() if function.deterministic else None
+
+        if key is None:
+            results, missing = np.empty(len(tweets)), range(len(tweets))
+        else:
+            results, missing = self._cache_lookup(key, tweets)
+
+        scored = []
+        failed = []
+
+        for index in missing:
+            try:
+                results[index] = function.run_code(tweets[index])
+                scored.append(index)
+            except Exception as error:
+                results[index] = fallback_score
+                failed.append((index, str(error)))
+
+        if key is not None and scored:
+            self._cache_store(key, tweets, results, scored, results[scored])
+
+        return results, failed
+
+    def process_tweets_safe(
+        self, tweets: List[Dict[str, Any]], fallback_score: float = 0.0
+    ) -> ScoringReport:
+        """
+        Purpose:
+            Run the algorithm on the tweets without stopping on errors.
+            Functions without batch code run once per tweet and keep the
+            scores that worked, batch code that fails on a batch is re-run
+            per tweet. Each failed (tweet, function) cell gets the fallback
+            score
+        Args:
+            tweets - List of tweets
+            fallback_score - unweighted score used for failed cells
+        Returns:
+            report - ScoringReport with the partial ranking and the failures
+        """
+
+        raw = {}
+        failures = []
+        raw_values = {}  # deterministic results by function key
+        failed_keys = {}  # deterministic failures by function key
+        tweets = self._share_features(tweets)
+
+        for func in self.functions:
+            name = func.get_name()
+            key = func.func.get_key() if func.func.deterministic else None
+
+            # One call per weighted function, counting the failed tweets
+            with self._measure(func, len(tweets)):
+                if key in failed_keys:
+                    # Same code already ran under another weight
+                    values, failed = raw_values[key], failed_keys[key]
+                elif func.func.batch_code is None and not func.func.is_async:
+                    # Per tweet code keeps its failures as they happen
+                    values, failed = self._run_per_tweet(func, tweets, fallback_score)
+
+                    if key is not None:
+                        raw_values[key] = values
+                        failed_keys[key] = failed
+                else:
+                    try:
+                        values = self._run_function(func, tweets, raw_values)
+                        failed = []
+                    except Exception:
+                        values, failed = self._run_isolated(
+                            func, tweets, fallback_score
+                        )
+
+                        if key is not None:
+                            raw_values[key] = values
+                            failed_keys[key] = failed
+
+            if self.instrumentation and failed:
+                self.instrumentation.record_errors(name, len(failed))
+
+            raw[name] = values
+
+            for index, error in failed:
+                failures.append(
+                    {
+                        "index": index,
+                        "id_str": tweets[index].get("id_str"),
+                        "function": name,
+                        "error": error,
+                    }
+                )
+
+        return ScoringReport(
+            [func.get_name() for func in self.functions],
+            [func.weight for func in self.functions],
+            raw,
+            [tweet.get("twitter_url") for tweet in tweets],
+            failures,
+            fallback_score,
+        )
+
+    def retry_failures(
+        self, tweets: List[Dict[str, Any]], report: ScoringReport
+    ) -> ScoringReport:
+        """
+        Purpose:
+            Re-score only the failed cells of a report, e.g. after fixing a
+            function or the tweet data
+        Args:
+            tweets - the same List of tweets the report was made from
+            report - ScoringReport from process_tweets_safe
+        Returns:
+            report - the same report, updated in place
+        """
+
+        funcs = {func.get_name(): func for func in self.functions}
+        still_failing = []
+
+        for failure in report.failures:
+            index = failure["index"]
+            func = funcs[failure["function"]]
+
+            try:
+                value = self._run_function(func, [tweets[index]], {})[0]
+            except Exception as error:
+                still_failing.append(dict(failure, error=str(error)))
+                continue
+
+            report.raw[failure["function"]][index] = value
+
+        report.failures = still_failing
+
+        return report
+
+    def process_tweets(
+        self,
+        tweets: List[Dict[str, Any]],
+        workers: int = None,
+        chunk_size: int = None,
+    ) -> "pd.DataFrame":
+        """
+        Purpose:
+            Run the algorithm on the tweets. Functions with batch code score
+            the whole list in one call, the rest are run per tweet
+        Args:
+            tweets - List of tweets
+            workers - number of processes to score with, None runs in this process
+            chunk_size - number of tweets sent to a worker at a time
+        Returns:
+            algo_tweets - sorted tweets based on algo
+        """
+        import pandas as pd
+
+        if workers and workers > 1:
+            columns = parallel.score_in_pool(self, tweets, workers, chunk_size)
+        else:
+            columns = self.score_columns(tweets)
+
+        columns["twitter_url"] = [tweet["twitter_url"] for tweet in tweets]
+
+        # Turn columns to df
+        df = pd.DataFrame(columns)
+
+        # Sort df, stable so ties keep timeline order
+        sorted_df = df.sort_values(by=["algo_score"], ascending=False, kind="stable")
+
+        return sorted_df
+
+    async def process_tweets_async(
+        self, tweets: List[Dict[str, Any]]
+    ) -> "pd.DataFrame":
+        """
+        Purpose:
+            Run the algorithm on the tweets, for algorithms with async
+            functions. Gives the same df as process_tweets
+        Args:
+            tweets - List of tweets
+        Returns:
+            algo_tweets - sorted tweets based on algo
+        """
+        import pandas as pd
+
+        columns = await self.score_columns_async(tweets)
+        columns["twitter_url"] = [tweet["twitter_url"] for tweet in tweets]
+
+        # Turn columns to df
+        df = pd.DataFrame(columns)
+
+        # Sort df, stable so ties keep timeline order
+        sorted_df = df.sort_values(by=["algo_score"], ascending=False, kind="stable")
 
         return sorted_df
 
 
+    def _iter_batches(
+        self, tweets: Iterable[Dict[str, Any]], batch_size: int
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Purpose:
+            Lazily pull tweets off an iterable batch by batch
+        Args:
+            tweets - Iterable of tweets, can be a generator still fetching
+            batch_size - number of tweets per batch
+        Returns:
+            generator of (position of first tweet, batch)
+        """
+
+        tweet_iter = iter(tweets)
+        start = 0
+
+        while True:
+            batch = list(itertools.islice(tweet_iter, batch_size))
+            if not batch:
+                return
+
+            yield start, batch
+            start += len(batch)
+
+    def _iter_scored_batches(
+        self, tweets: Iterable[Dict[str, Any]], batch_size: int
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]], Dict[str, np.ndarray]]]:
+        """
+        Purpose:
+            Lazily pull tweets off an iterable and score them batch by batch
+        Args:
+            tweets - Iterable of tweets, can be a generator still fetching
+            batch_size - number of tweets scored per call
+        Returns:
+            generator of (position of first tweet, batch, columns)
+        """
+
+        for start, batch in self._iter_batches(tweets, batch_size):
+            yield start, batch, self.score_columns(batch)
+
+    def iter_scores(
+        self, tweets: Iterable[Dict[str, Any]], batch_size: int = 256
+    ) -> Iterator[Tuple[int, Dict[str, Any], float]]:
+        """
+        Purpose:
+            Score tweets as they arrive, without keeping them around
+        Args:
+            tweets - Iterable of tweets
+            batch_size - number of tweets scored per call
+        Returns:
+            generator of (position, tweet, algo_score)
+        """
+
+        for start, batch, columns in self._iter_scored_batches(tweets, batch_size):
+            for offset, tweet in enumerate(batch):
+                yield start + offset, tweet, float(columns["algo_score"][offset])
+
+    def rank_top_k(
+        self,
+        tweets: Iterable[Dict[str, Any]],
+        k: int,
+        batch_size: int = 256,
+        prune: bool = False,
+    ) -> "pd.DataFrame":
+        """
+        Purpose:
+            Get the k best tweets with a bounded heap, so memory stays O(k)
+            and only the survivors keep their per function scores
+        Args:
+            tweets - Iterable of tweets, can be a generator still fetching
+            k - number of tweets to keep
+            batch_size - number of tweets scored per call
+            prune - skip the remaining functions of tweets that can no
+                longer make the top k, see _score_pruned
+        Returns:
+            algo_tweets - the top k rows of process_tweets, in the same order
+        """
+
+        names = [func.get_name() for func in self.functions]
+
+        # Min heap of (score, -position, row), the worst survivor is on top.
+        # On equal scores the later tweet loses, like the stable sort
+        heap = []
+
+        if k <= 0:
+            return self._rows_to_df([], names)
+
+        costs = self._get_costs()  # seconds per tweet by function name
+
+        for start, batch in self._iter_batches(tweets, batch_size):
+            if prune:
+                offsets, columns = self._score_pruned(batch, k, heap, costs)
+            else:
+                offsets, columns = range(len(batch)), self.score_columns(batch)
+
+            scores = columns["algo_score"]
+
+            for row_index, offset in enumerate(offsets):
+                key = (float(scores[row_index]), -(start + offset))
+
+                if len(heap) >= k and key <= heap[0][:2]:
+                    continue
+
+                row = {name: columns[name][row_index] for name in names}
+                row["algo_score"] = key[0]
+                row["twitter_url"] = batch[offset]["twitter_url"]
+
+                if len(heap) < k:
+                    heapq.heappush(heap, (key[0], key[1], row))
+                else:
+                    heapq.heapreplace(heap, (key[0], key[1], row))
+
+        heap.sort(reverse=True)
+
+        return self._rows_to_df(heap, names)
+
+    def _get_costs(self) -> Dict[str, float]:
+        """
+        Purpose:
+            Get the measured cost of each weighted function, from the
+            instrumentation if it is on
+        Args:
+            N/A
+        Returns:
+            costs - seconds per tweet by function name, only measured ones
+        """
+
+        costs = {}
+
+        if self.instrumentation:
+            for name, stats in self.instrumentation.stats.items():
+                if stats.tweets:
+                    costs[name] = stats.total_time / stats.tweets
+
+        return costs
+
+    def _score_pruned(
+        self,
+        batch: List[Dict[str, Any]],
+        k: int,
+        heap: List[Tuple[float, int, Dict]],
+        costs: Dict[str, float],
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Purpose:
+            Score a batch for rank_top_k, dropping tweets that can not make
+            the top k. Each function adds between -100 and 100 times its
+            weight, so after some functions a tweet's best possible score is
+            known. Functions run in order of weight per cost, and once a
+            tweet's best possible score is below the k-th best score it
+            skips the rest. Survivors are scored in function order, so
+            their scores match score_columns exactly
+        Args:
+            batch - List of tweets
+            k - number of tweets kept
+            heap - the rank_top_k heap, its scores are exact
+            costs - seconds per tweet by function name, updated in place
+        Returns:
+            (offsets, columns) - positions of the survivors in the batch,
+                and their columns like score_columns
+        """
+
+        bounds = [100 * abs(func.weight) for func in self.functions]
+
+        # Unmeasured functions cost the average of the measured ones
+        known = [
+            costs[func.get_name()]
+            for func in self.functions
+            if func.get_name() in costs
+        ]
+        default_cost = sum(known) / len(known) if known else 1.0
+
+        def priority(position: int) -> float:
+            cost = costs.get(self.functions[position].get_name(), default_cost)
+            return bounds[position] / max(cost, 1e-9)
+
+        order = sorted(range(len(self.functions)), key=priority, reverse=True)
+
+        # Partial sums add up in a different order than score_columns
+        epsilon = 1e-9 * max(sum(bounds), 1.0)
+
+        batch = self._share_features(batch)
+        alive = np.arange(len(batch))
+        partial = np.zeros(len(batch))
+        remaining = sum(bounds)
+        values = {}  # unweighted scores by position of the function
+        raw_values = {}  # deterministic (positions, scores) by function key
+
+        for position in order:
+            func = self.functions[position]
+            key = func.func.get_key() if func.func.deterministic else None
+            alive_tweets = [batch[index] for index in alive]
+
+            if key in raw_values:
+                # Same code under several weights only runs once, the
+                # tweets still alive are a subset of the ones it scored
+                scored, raw = raw_values[key]
+                with self._measure(func, len(alive_tweets)):
+                    func_values = raw[np.searchsorted(scored, alive)]
+            else:
+                start_time = time.perf_counter()
+                with self._measure(func, len(alive_tweets)):
+                    func_values = self._run_function(func, alive_tweets, {})
+                elapsed = time.perf_counter() - start_time
+
+                if alive_tweets:
+                    costs[func.get_name()] = elapsed / len(alive_tweets)
+
+                if key is not None:
+                    raw_values[key] = (alive, func_values)
+
+            values[position] = (alive, func_values)
+            partial[alive] += func_values * func.weight
+            remaining -= bounds[position]
+
+            # k tweets with these scores or better are known to exist
+            lower = np.concatenate(
+                ([entry[0] for entry in heap], partial[alive] - remaining)
+            )
+            if len(lower) < k:
+                continue
+
+            threshold = np.partition(lower, len(lower) - k)[len(lower) - k]
+            alive = alive[partial[alive] + remaining >= threshold - epsilon]
+
+            if not len(alive):
+                break
+
+        columns = {}
+        algo_score = np.zeros(len(alive))
+
+        for position, func in enumerate(self.functions):
+            scored, func_values = values.get(position, (alive, np.empty(0)))
+
+            # Survivors are a subset of the tweets each function scored
+            curr_values = func_values[np.searchsorted(scored, alive)] * func.weight
+            columns[func.get_name()] = curr_values
+
+            algo_score = algo_score + curr_values
+
+        columns["algo_score"] = algo_score
+
+        return alive, columns
+
+    def _rows_to_df(self, entries: List[Tuple[float, int, Dict]], names: List[str]):
+        """
+        Purpose:
+            Turn sorted heap entries into a df shaped like process_tweets
+        Args:
+            entries - list of (score, -position, row)
+            names - names of the functions
+        Returns:
+            df - the rows indexed by tweet position
+        """
+        import pandas as pd
+
+        columns = names + ["algo_score", "twitter_url"]
+        index = [-entry[1] for entry in entries]
+
+        return pd.DataFrame([entry[2] for entry in entries], index=index, columns=columns)
+
 
-def load_algo(filename) -> Algorithm:
+def load_algo(filename, verify: bool = False) -> Algorithm:
     """
     Purpose:
-        Load the algo
+        Load the algo, function code is imported on first use
     Args:
-        filename: file to load
+        filename: file to load, artifact or legacy pickle
+        verify: import all the code now and check it has not changed
     Returns:
         Algorithm: The loaded Algorithm
     """
-    # read the pickle file
-    picklefile = open(filename, "rb")
-    # unpickle the dataframe
-    loaded_algo = pickle.load(picklefile)
-    # close file
-    picklefile.close()
-    return loaded_algo
+    return artifact.load_artifact(filename, verify=verify)
@@ -0,0 +1,348 @@
+"""
+Purpose:
+    This file contains the versioned algorithm artifact format. The artifact
+    is JSON that stores the structure of an Algorithm as data, with the
+    function code stored as import paths and a hash of the code
+"""
+
+from typing import Any, Callable, Dict
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import pickle
+
+from . import utils
+from .function import Function
+from .weighted_function import WeightedFunction
+
+ARTIFACT_FORMAT = "twitter_algo"
+ARTIFACT_VERSION = 1
+
+# First byte of every pickle since protocol 2
+PICKLE_MAGIC = b"\x80"
+
+
+class StaleArtifactError(RuntimeError):
+    """
+    Purpose:
+        Error raised when the code an artifact points to has changed since it was saved
+    """
+
+
+def get_code_ref(code: Callable) -> str:
+    """
+    Purpose:
+        Get the import path of a function
+    Args:
+        code: the function
+    Returns:
+        ref: "module:qualname"
+    """
+    if isinstance(code, LazyCode):
+        return code.ref
+
+    module = getattr(code, "__module__", None)
+    qualname = getattr(code, "__qualname__", None)
+
+    if not module or not qualname or "<" in qualname or module == "__main__":
+        raise ValueError(f"Function code {code} must be importable to be saved")
+
+    return f"{module}:{qualname}"
+
+
+def get_code_hash(code: Callable) -> str:
+    """
+    Purpose:
+        Hash the source of a function, to find stale artifacts
+    Args:
+        code: the function
+    Returns:
+        code_hash: sha256 hex digest
+    """
+    if isinstance(code, LazyCode):
+        return code.code_hash
+
+    try:
+        source = inspect.getsource(code).encode()
+    except (OSError, TypeError):
+        # No source on disk, fall back to the bytecode
+        source = code.__code__.co_code
+
+    return hashlib.sha256(source).hexdigest()
+
+
+def resolve_code_ref(ref: str) -> Callable:
+    """
+    Purpose:
+        Import a function from its import path
+    Args:
+        ref: "module:qualname"
+    Returns:
+        code: the function
+    """
+    module_name, qualname = ref.split(":")
+    code = importlib.import_module(module_name)
+
+    for attr in qualname.split("."):
+        code = getattr(code, attr)
+
+    return code
+
+
+class LazyCode:
+    def __init__(self, ref: str, code_hash: str):
+        """
+        Purpose:
+            Init LazyCode Class, stands in for function code and only imports
+            it on the first call
+        Args:
+            ref: import path of the code, "module:qualname"
+            code_hash: hash of the code when the artifact was saved
+        Returns:
+            LazyCode class
+        """
+
+        self.ref = ref
+        self.code_hash = code_hash
+        self.__module__, self.__qualname__ = ref.split(":")
+        self._code = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"ref": self.ref, "code_hash": self.code_hash}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["ref"], state["code_hash"])
+
+    def __repr__(self) -> str:
+        return f"LazyCode({self.ref})"
+
+    def resolve(self) -> Callable:
+        """
+        Purpose:
+            Import the code and check it has not changed since it was saved
+        Args:
+            N/A
+        Returns:
+            code: the function
+        """
+        if self._code is None:
+            code = resolve_code_ref(self.ref)
+
+            if get_code_hash(code) != self.code_hash:
+                raise StaleArtifactError(
+                    f"Code for {self.ref} changed since the algo was saved"
+                )
+
+            self._code = code
+
+        return self._code
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+
+def to_artifact(algo) -> Dict[str, Any]:
+    """
+    Purpose:
+        Turn an Algorithm into artifact data
+    Args:
+        algo: the Algorithm
+    Returns:
+        artifact: JSON serializable dict
+    """
+    functions = []
+
+    for weighted_func in algo.functions:
+        func = weighted_func.func
+        batch_code = func.batch_code
+
+        functions.append(
+            {
+                "name": weighted_func.get_name(),
+                "weight": weighted_func.weight,
+                "function": {
+                    "name": func.name,
+                    "desc": func.desc,
+                    "code": get_code_ref(func.code),
+                    "code_hash": get_code_hash(func.code),
+                    "batch_code": get_code_ref(batch_code) if batch_code else None,
+                    "batch_code_hash": (
+                        get_code_hash(batch_code) if batch_code else None
+                    ),
+                    "deterministic": func.deterministic,
+                    "is_async": func.is_async,
+                    "max_concurrency": func.max_concurrency,
+                    "timeout": func.timeout,
+                    "uses_features": func.uses_features,
+                },
+            }
+        )
+
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "name": algo.name,
+        "desc": algo.desc,
+        "cache_size": algo.get_cache().max_size,
+        "functions": functions,
+    }
+
+
+def get_fingerprint(algo) -> str:
+    """
+    Purpose:
+        Hash what an Algorithm scores with, its functions, code and weights
+    Args:
+        algo: the Algorithm
+    Returns:
+        fingerprint: hex sha256, changes when the scores may change
+    """
+    data = to_artifact(algo)
+    # Neither changes the scores
+    data.pop("desc")
+    data.pop("cache_size")
+
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def from_artifact(artifact: Dict[str, Any]):
+    """
+    Purpose:
+        Build an Algorithm from artifact data, without importing any code
+    Args:
+        artifact: artifact dict
+    Returns:
+        Algorithm: the algorithm, its code is imported on first use
+    """
+    from .algorithm import Algorithm
+
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError("Not an algorithm artifact")
+
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version {artifact.get('version')}")
+
+    weighted_funcs = []
+    functions = {}  # Functions with the same code are shared, like when defined
+
+    for entry in artifact["functions"]:
+        func_data = entry["function"]
+        key = (func_data["code"], func_data["batch_code"], func_data["name"])
+
+        if key not in functions:
+            batch_code = None
+            if func_data["batch_code"]:
+                batch_code = LazyCode(
+                    func_data["batch_code"], func_data["batch_code_hash"]
+                )
+
+            functions[key] = Function(
+                func_data["name"],
+                func_data["desc"],
+                LazyCode(func_data["code"], func_data["code_hash"]),
+                batch_code=batch_code,
+                deterministic=func_data["deterministic"],
+                is_async=func_data.get("is_async", False),
+                max_concurrency=func_data.get("max_concurrency", 16),
+                timeout=func_data.get("timeout"),
+                uses_features=func_data.get("uses_features", False),
+            )
+
+        weighted_funcs.append(
+            WeightedFunction(entry["weight"], functions[key], entry["name"])
+        )
+
+    return Algorithm(
+        artifact["name"],
+        artifact["desc"],
+        weighted_funcs,
+        cache_size=artifact.get("cache_size", 4096),
+    )
+
+
+def save_artifact(algo, path: str) -> None:
+    """
+    Purpose:
+        Save an Algorithm as an artifact file
+    Args:
+        algo: the Algorithm
+        path: file to save to
+    Returns:
+        N/A
+    """
+    utils.save_json(path, to_artifact(algo))
+
+
+def is_legacy_pickle(path: str) -> bool:
+    """
+    Purpose:
+        Check if a .algo file is an old pickle
+    Args:
+        path: the .algo file
+    Returns:
+        True if the file is a pickle
+    """
+    with open(path, "rb") as algo_file:
+        return algo_file.read(1) == PICKLE_MAGIC
+
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """
+    Purpose:
+        Read an artifact without importing any of its code
+    Args:
+        path: the .algo file
+    Returns:
+        artifact: the artifact dict
+    """
+    if is_legacy_pickle(path):
+        raise ValueError(f"{path} is a legacy pickle, run migrate_algo on it first")
+
+    return utils.load_json(path)
+
+
+def load_artifact(path: str, verify: bool = False):
+    """
+    Purpose:
+        Load an Algorithm from a .algo file, old pickles are still read
+    Args:
+        path: the .algo file
+        verify: import all the code now, raising StaleArtifactError if any changed
+    Returns:
+        Algorithm: the loaded Algorithm
+    """
+    if is_legacy_pickle(path):
+        logging.warning(f"{path} is a legacy pickle, run migrate_algo to upgrade it")
+
+        with open(path, "rb") as picklefile:
+            return pickle.load(picklefile)
+
+    algo = from_artifact(utils.load_json(path))
+
+    if verify:
+        for weighted_func in algo.functions:
+            for code in (weighted_func.func.code, weighted_func.func.batch_code):
+                if isinstance(code, LazyCode):
+                    code.resolve()
+
+    return algo
+
+
+def migrate_algo(path: str) -> None:
+    """
+    Purpose:
+        Rewrite an old pickled .algo file as an artifact
+    Args:
+        path: the .algo file
+    Returns:
+        N/A
+    """
+    if not is_legacy_pickle(path):
+        return
+
+    with open(path, "rb") as picklefile:
+        algo = pickle.load(picklefile)
+
+    save_artifact(algo, path)
@@ -0,0 +1,288 @@
+"""
+Purpose:
+    This file contains the class for BatchRunner, which scores archived
+    tweets from JSONL or Parquet chunk by chunk and writes the scores to
+    Parquet, so memory does not grow with the archive
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple
+import json
+import logging
+import os
+
+import pandas as pd
+
+from . import artifact
+from . import utils
+
+PROGRESS_NAME = "_progress.json"
+
+
+def get_pyarrow():
+    """
+    Purpose:
+        Import pyarrow, only needed for Parquet
+    Args:
+        N/A
+    Returns:
+        (pyarrow, pyarrow.parquet) modules
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow must be installed to read and write Parquet")
+
+    return pyarrow, pyarrow.parquet
+
+
+def add_twitter_url(tweet: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Purpose:
+        Add the twitter_url to an archived tweet that does not have one
+    Args:
+        tweet: tweet JSON
+    Returns:
+        tweet: the same tweet
+    """
+    if not tweet.get("twitter_url"):
+        username = tweet["user"]["screen_name"]  # Username vlaue
+        id_str = tweet["id_str"]  # id str
+
+        # Get the twitter url
+        tweet["twitter_url"] = f"https://twitter.com/{username}/status/{id_str}"
+
+    return tweet
+
+
+def iter_jsonl_chunks(
+    path: str, chunk_size: int, offset: int = 0
+) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Purpose:
+        Read a JSONL file of tweets a chunk at a time
+    Args:
+        path: path of the file, one tweet JSON per line
+        chunk_size: number of tweets per chunk
+        offset: byte offset to start reading at, from a previous chunk
+    Returns:
+        generator of (tweets, byte offset after the chunk)
+    """
+    with open(path, "rb") as tweet_file:
+        tweet_file.seek(offset)
+        chunk = []
+
+        for line in iter(tweet_file.readline, b""):
+            if not line.strip():
+                continue
+
+            chunk.append(add_twitter_url(json.loads(line)))
+
+            if len(chunk) == chunk_size:
+                yield chunk, tweet_file.tell()
+                chunk = []
+
+        if chunk:
+            yield chunk, tweet_file.tell()
+
+
+def iter_parquet_chunks(
+    path: str, chunk_size: int, offset: int = 0
+) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Purpose:
+        Read a Parquet file of tweets a chunk at a time
+    Args:
+        path: path of the file, one row per tweet
+        chunk_size: number of tweets per chunk
+        offset: number of rows to skip, from a previous chunk
+    Returns:
+        generator of (tweets, row offset after the chunk)
+    """
+    _, parquet = get_pyarrow()
+
+    rows = 0
+    pending = []
+
+    for record_batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        batch_start = rows
+        rows += record_batch.num_rows
+
+        # Skipped rows are never turned into dicts
+        if rows <= offset:
+            continue
+
+        pending.extend(record_batch.to_pylist()[max(offset - batch_start, 0) :])
+
+        # Record batches stop at row groups, so regroup into full chunks
+        while len(pending) >= chunk_size:
+            chunk, pending = pending[:chunk_size], pending[chunk_size:]
+            yield [add_twitter_url(tweet) for tweet in chunk], rows - len(pending)
+
+    if pending:
+        yield [add_twitter_url(tweet) for tweet in pending], rows
+
+
+class BatchRunner:
+    def __init__(self, algo, output_dir: str, chunk_size: int = 10000):
+        """
+        Purpose:
+            Init BatchRunner Class
+        Args:
+            algo: the Algorithm to score with
+            output_dir: folder for the part files and the progress file
+            chunk_size: number of tweets scored and written at a time
+        Returns:
+            BatchRunner class
+        """
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        self.algo = algo
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.progress_path = os.path.join(output_dir, PROGRESS_NAME)
+
+    def get_part_path(self, chunk: int) -> str:
+        """
+        Purpose:
+            Get the path of a chunk's part file
+        Args:
+            chunk: number of the chunk
+        Returns:
+            path of the Parquet file
+        """
+        return os.path.join(self.output_dir, f"part-{chunk:05d}.parquet")
+
+    def load_progress(self, source: str) -> Dict[str, Any]:
+        """
+        Purpose:
+            Load the progress of an earlier run on the same source, with
+            the same algo functions, code and weights
+        Args:
+            source: path of the tweet archive
+        Returns:
+            progress: chunks done and where to read the next chunk from
+        """
+        progress = {
+            "source": os.path.abspath(source),
+            "algo": self.algo.name,
+            "fingerprint": artifact.get_fingerprint(self.algo),
+            "chunk_size": self.chunk_size,
+            "chunks_done": 0,
+            "offset": 0,
+            "tweets_done": 0,
+            "complete": False,
+        }
+
+        if not os.path.exists(self.progress_path):
+            return progress
+
+        saved = utils.load_json(self.progress_path)
+
+        # Runs saved before the fingerprint was added can not be checked
+        for key in ["source", "algo", "fingerprint", "chunk_size"]:
+            if saved.get(key) != progress[key]:
+                raise ValueError(
+                    f"{self.output_dir} has a run with a different {key}, "
+                    "use another output folder"
+                )
+
+        return saved
+
+    def write_part(self, chunk: int, df: pd.DataFrame) -> None:
+        """
+        Purpose:
+            Write a chunk's scores, replacing the file in one step so a crash
+            never leaves half a part
+        Args:
+            chunk: number of the chunk
+            df: scores of the chunk
+        Returns:
+            N/A
+        """
+        pyarrow, parquet = get_pyarrow()
+
+        part_path = self.get_part_path(chunk)
+        tmp_path = f"{part_path}.tmp"
+
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, part_path)
+
+    def score_chunk(self, tweets: List[Dict[str, Any]], start: int) -> pd.DataFrame:
+        """
+        Purpose:
+            Score one chunk
+        Args:
+            tweets: the chunk of tweets
+            start: position of the first tweet in the archive
+        Returns:
+            df: scores in archive order, with the position and id_str
+        """
+        columns = {
+            "position": range(start, start + len(tweets)),
+            "id_str": [tweet["id_str"] for tweet in tweets],
+        }
+        columns.update(self.algo.score_columns(tweets))
+        columns["twitter_url"] = [tweet["twitter_url"] for tweet in tweets]
+
+        return pd.DataFrame(columns)
+
+    def run(self, source: str) -> Dict[str, Any]:
+        """
+        Purpose:
+            Score an archive, resuming after the last chunk written by an
+            earlier run into the same output folder
+        Args:
+            source: path of a .jsonl or .parquet file of tweets
+        Returns:
+            progress: chunks and tweets done
+        """
+        if source.endswith(".parquet"):
+            iter_chunks = iter_parquet_chunks
+        elif source.endswith((".jsonl", ".json")):
+            iter_chunks = iter_jsonl_chunks
+        else:
+            raise ValueError("Source must be a .jsonl or .parquet file")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        progress = self.load_progress(source)
+
+        if progress["complete"]:
+            return progress
+
+        if progress["chunks_done"]:
+            logging.info(f"Resuming after chunk {progress['chunks_done']}")
+
+        for tweets, offset in iter_chunks(source, self.chunk_size, progress["offset"]):
+            chunk = progress["chunks_done"]
+
+            self.write_part(chunk, self.score_chunk(tweets, progress["tweets_done"]))
+
+            # Only count the chunk once its part is on disk
+            progress["chunks_done"] = chunk + 1
+            progress["offset"] = offset
+            progress["tweets_done"] += len(tweets)
+            utils.save_json_atomic(self.progress_path, progress)
+
+        progress["complete"] = True
+        utils.save_json_atomic(self.progress_path, progress)
+
+        return progress
+
+    def iter_results(self) -> Iterator[pd.DataFrame]:
+        """
+        Purpose:
+            Read the scores back a part at a time
+        Args:
+            N/A
+        Returns:
+            generator of the df of each written chunk, in archive order
+        """
+        if not os.path.exists(self.progress_path):
+            return
+
+        for chunk in range(utils.load_json(self.progress_path)["chunks_done"]):
+            yield pd.read_parquet(self.get_part_path(chunk))
@@ -0,0 +1,104 @@
+"""
+Purpose:
+    This file contains the class for ResultCache
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Returned by get when the key is not in the cache
+MISSING = object()
+
+
+class ResultCache:
+    def __init__(self, max_size: int = 4096):
+        """
+        Purpose:
+            Init ResultCache Class, a bounded LRU cache of Function results
+        Args:
+            max_size: most results to keep before evicting the least recently used
+        Returns:
+            ResultCache class
+        """
+
+        if max_size < 0:
+            raise ValueError("Cache size must be 0 or more")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Purpose:
+            Get a cached result and mark it as recently used
+        Args:
+            key: the cache key
+        Returns:
+            result: the cached result, or MISSING
+        """
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+
+        self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """
+        Purpose:
+            Cache a result, evicting the least recently used ones if full
+        Args:
+            key: the cache key
+            result: the result to cache
+        Returns:
+            N/A
+        """
+        if self.max_size == 0:
+            return
+
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Purpose:
+            Drop all cached results and reset the counters
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Purpose:
+            Get the cache counters
+        Args:
+            N/A
+        Returns:
+            stats: size, max_size, hits, misses and evictions
+        """
+        return {
+            "size": len(self._results),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
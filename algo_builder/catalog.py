@@ -0,0 +1,177 @@
+"""
+Purpose:
+    This file contains the class for AlgoCatalog
+"""
+
+from typing import Any, Dict, Tuple
+import glob
+import logging
+import os
+
+from . import artifact
+from . import utils
+
+MANIFEST_NAME = "catalog.json"
+MANIFEST_VERSION = 1
+
+
+def get_manifest_path(folder: str) -> str:
+    """
+    Purpose:
+        Get the path of the catalog manifest in a folder
+    Args:
+        folder: folder of saved algos
+    Returns:
+        path of the manifest
+    """
+    return os.path.join(folder, MANIFEST_NAME)
+
+
+def scan_folder(folder: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Purpose:
+        Build the catalog entries from the per algo json files
+    Args:
+        folder: folder of saved algos
+    Returns:
+        algos: entry per algo name with desc and algo_path
+    """
+    algos = {}
+
+    for algo_json in sorted(glob.glob(os.path.join(folder, "*.json"))):
+        if os.path.basename(algo_json) == MANIFEST_NAME:
+            continue
+
+        algo_data = utils.load_json(algo_json)
+        algos[algo_data["name"]] = {
+            "desc": algo_data["desc"],
+            "algo_path": algo_data["algo_path"],
+        }
+
+    return algos
+
+
+def get_lock_path(folder: str) -> str:
+    """
+    Purpose:
+        Get the path of the lock file held while the manifest is updated
+    Args:
+        folder: folder of saved algos
+    Returns:
+        path of the lock file
+    """
+    return os.path.join(folder, f"{MANIFEST_NAME}.lock")
+
+
+def build_manifest(folder: str) -> None:
+    """
+    Purpose:
+        Write the manifest from the per algo json files, if it is missing
+    Args:
+        folder: folder of saved algos
+    Returns:
+        N/A
+    """
+    manifest_path = get_manifest_path(folder)
+
+    with utils.file_lock(get_lock_path(folder)):
+        if not os.path.exists(manifest_path):
+            utils.save_json_atomic(
+                manifest_path,
+                {"version": MANIFEST_VERSION, "algos": scan_folder(folder)},
+            )
+
+
+def register_algo(folder: str, algo_json: Dict[str, Any]) -> None:
+    """
+    Purpose:
+        Add or update an algo in the folder's manifest. The update is done
+        under a file lock, so concurrent saves do not lose entries
+    Args:
+        folder: folder of saved algos
+        algo_json: the algo metadata with name, desc and algo_path
+    Returns:
+        N/A
+    """
+    manifest_path = get_manifest_path(folder)
+
+    with utils.file_lock(get_lock_path(folder)):
+        if os.path.exists(manifest_path):
+            algos = utils.load_json(manifest_path)["algos"]
+        else:
+            algos = scan_folder(folder)
+
+        algos[algo_json["name"]] = {
+            "desc": algo_json["desc"],
+            "algo_path": algo_json["algo_path"],
+        }
+
+        utils.save_json_atomic(
+            manifest_path, {"version": MANIFEST_VERSION, "algos": algos}
+        )
+
+
+class AlgoCatalog:
+    def __init__(self, folder: str = "saved_algos"):
+        """
+        Purpose:
+            Init AlgoCatalog Class, reads saved algos from one manifest file
+            and keeps loaded Algorithms in memory until their file changes
+        Args:
+            folder: folder of saved algos
+        Returns:
+            AlgoCatalog class
+        """
+
+        self.folder = folder
+        self.manifest_path = get_manifest_path(folder)
+        self._manifest_stat = None
+        self._algos = {}
+        self._loaded = {}  # name -> (file stat, Algorithm)
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def list_algos(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Purpose:
+            Get the saved algos, the manifest is only read again if it changed
+        Args:
+            N/A
+        Returns:
+            algos: entry per algo name with desc and algo_path
+        """
+        if not os.path.exists(self.manifest_path):
+            logging.info(f"No catalog in {self.folder}, building one")
+            build_manifest(self.folder)
+
+        manifest_stat = self._stat(self.manifest_path)
+
+        if manifest_stat != self._manifest_stat:
+            self._algos = utils.load_json(self.manifest_path)["algos"]
+            self._manifest_stat = manifest_stat
+
+        return self._algos
+
+    def load(self, name: str):
+        """
+        Purpose:
+            Load an algo by name, reusing the loaded one if its file is unchanged
+        Args:
+            name: name of the algo
+        Returns:
+            Algorithm: the loaded Algorithm
+        """
+        algo_path = self.list_algos()[name]["algo_path"]
+        algo_stat = self._stat(algo_path)
+
+        cached = self._loaded.get(name)
+        if cached and cached[0] == (algo_path, algo_stat):
+            return cached[1]
+
+        algo = artifact.load_artifact(algo_path)
+        self._loaded[name] = ((algo_path, algo_stat), algo)
+
+        return algo
@@ -0,0 +1,216 @@
+"""
+Purpose:
+    This file contains the class for CompiledAlgorithm, an Algorithm turned
+    into one generated scoring function
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+import numbers
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .artifact import LazyCode
+from .features import share_features
+from .function import FunctionError
+
+# Template for the code run per tweet by one weighted function
+CALL_TEMPLATE = """
+            stage = {position}
+            value_{position} = code_{position}({argument})
+            if value_{position}.__class__ is not float and not isinstance(
+                value_{position}, Number
+            ):
+                raise ValueError("Function must return a number")
+            if not -100 <= value_{position} <= 100:
+                raise ValueError("Function must return a number between -100 and 100")
+            col_{position}[index] = value_{position} * {weight}"""
+
+# Template for a weighted function sharing the result of an earlier one
+SHARED_TEMPLATE = """
+            col_{position}[index] = value_{source} * {weight}"""
+
+
+class CompiledAlgorithm:
+    def __init__(self, algo):
+        """
+        Purpose:
+            Init CompiledAlgorithm Class, generates one function that runs
+            every per tweet function of the algo with the weights inlined.
+            Functions with batch code still run once per batch. Compile
+            again after changing the algo
+        Args:
+            algo: the Algorithm
+        Returns:
+            CompiledAlgorithm class
+        """
+
+        self.algo = algo
+        self.names = [func.get_name() for func in algo.functions]
+        self.function_names = [func.func.name for func in algo.functions]
+
+        for func in algo.functions:
+            if func.func.is_async:
+                raise ValueError(
+                    f"Can not compile async function {func.get_name()}, "
+                    "use process_tweets_async"
+                )
+
+        self.source, self._score = self._generate()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Generated code can not be pickled, it is made again on load
+        return {"algo": self.algo}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["algo"])
+
+    def _generate(self):
+        """
+        Purpose:
+            Generate the source of the scoring function and exec it
+        Args:
+            N/A
+        Returns:
+            (source, score) - the generated source and function
+        """
+
+        namespace = {"Number": numbers.Number}
+        body = []
+        columns = []
+        shared = {}  # position of the first run by deterministic function key
+
+        for position, func in enumerate(self.algo.functions):
+            if func.func.batch_code is not None:
+                continue
+
+            columns.append(f"col_{position}")
+            weight = repr(float(func.weight))
+            key = func.func.get_key() if func.func.deterministic else None
+
+            if key in shared:
+                body.append(
+                    SHARED_TEMPLATE.format(
+                        position=position, source=shared[key], weight=weight
+                    )
+                )
+                continue
+
+            namespace[f"code_{position}"] = get_code(func.func)
+            # Functions that use features get the shared TweetFeatures
+            argument = "features[index]" if func.func.uses_features else "tweet"
+            body.append(
+                CALL_TEMPLATE.format(
+                    position=position, weight=weight, argument=argument
+                )
+            )
+
+            if key is not None:
+                shared[key] = position
+
+        if not body:
+            body.append("\n            pass")
+
+        source = (
+            f"def score(tweets, {', '.join(['features', 'names'] + columns)}):\n"
+            "    stage = index = None\n"
+            "    try:\n"
+            "        for index, tweet in enumerate(tweets):"
+            + "".join(body)
+            + "\n    except Exception as error:\n"
+            "        raise FunctionError(\n"
+            '            f"{names[stage]} failed on tweet {index}: {error}",\n'
+            "            names[stage],\n"
+            "            index,\n"
+            "        ) from error\n"
+        )
+
+        namespace["FunctionError"] = FunctionError
+        exec(compile(source, f"<compiled {self.algo.name}>", "exec"), namespace)
+
+        return source, namespace["score"]
+
+    def score_columns(self, tweets: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Purpose:
+            Run all the functions in the algorithm on the tweets, gives the
+            same scores as Algorithm.score_columns without using its cache
+            or instrumentation
+        Args:
+            tweets - List of tweets
+        Returns:
+            columns - weighted scores per function name, plus the algo_score
+        """
+
+        num_tweets = len(tweets)
+        values = []
+        per_tweet = []
+
+        # Only wrapped when a function uses features, like Algorithm
+        features = tweets
+        if any(func.func.uses_features for func in self.algo.functions):
+            features = share_features(tweets)
+
+        for func in self.algo.functions:
+            if func.func.batch_code is None:
+                column = np.empty(num_tweets)
+                per_tweet.append(column)
+            else:
+                column = func.func.run_batch(features) * func.weight
+
+            values.append(column)
+
+        if per_tweet and num_tweets:
+            self._score(tweets, features, self.function_names, *per_tweet)
+
+        columns = {}
+        algo_score = np.zeros(num_tweets)  # The score for the algo
+
+        # Add up in function order, so the scores match score_columns
+        for name, column in zip(self.names, values):
+            columns[name] = column
+            algo_score = algo_score + column
+
+        columns["algo_score"] = algo_score
+
+        return columns
+
+    def process_tweets(self, tweets: List[Dict[str, Any]]) -> "pd.DataFrame":
+        """
+        Purpose:
+            Run the algorithm on the tweets, like Algorithm.process_tweets
+        Args:
+            tweets - List of tweets
+        Returns:
+            algo_tweets - sorted tweets based on algo
+        """
+        import pandas as pd
+
+        columns = self.score_columns(tweets)
+        columns["twitter_url"] = [tweet["twitter_url"] for tweet in tweets]
+
+        # Turn columns to df
+        df = pd.DataFrame(columns)
+
+        # Sort df, stable so ties keep timeline order
+        sorted_df = df.sort_values(by=["algo_score"], ascending=False, kind="stable")
+
+        return sorted_df
+
+
+def get_code(func: Any) -> Callable:
+    """
+    Purpose:
+        Get the plain code of a Function, importing lazy code now
+    Args:
+        func: the Function
+    Returns:
+        code: the function
+    """
+    code = func.code
+    if isinstance(code, LazyCode):
+        code = code.resolve()
+
+    return code
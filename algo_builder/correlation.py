@@ -0,0 +1,195 @@
+"""
+Purpose:
+    This file contains the class for CorrelationEngine, which computes how
+    each function score correlates with the algo_score
+"""
+
+from typing import List
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .cache import MISSING, ResultCache
+
+METHODS = ["pearson", "mutual_info-regression"]
+
+
+def get_feature_cols(df: pd.DataFrame, target: str = "algo_score") -> List[str]:
+    """
+    Purpose:
+        Get the numeric feature columns of a scored df
+    Args:
+        df - Pandas dataframe from process_tweets
+        target - the target column
+    Returns:
+        feature_cols - names of the feature columns
+    """
+    return [
+        col
+        for col in df.columns
+        if col != target and col != "twitter_url" and df[col].dtype != "object"
+    ]
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Purpose:
+        Hash the content of a df, so equal frames share cached results
+    Args:
+        df - Pandas dataframe
+    Returns:
+        frame_hash - sha256 hex digest of the values and column names
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    frame_hash = hashlib.sha256(row_hashes.tobytes())
+    frame_hash.update("\0".join(map(str, df.columns)).encode())
+    return frame_hash.hexdigest()
+
+
+def stratified_sample(
+    df: pd.DataFrame, target: str, sample_size: int, num_strata: int = 10, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Purpose:
+        Sample rows evenly across quantile bins of the target, so the sample
+        keeps the spread of scores
+    Args:
+        df - Pandas dataframe
+        target - the column to stratify on
+        sample_size - number of rows to keep
+        num_strata - number of quantile bins
+        seed - random seed
+    Returns:
+        sample_df - the sampled rows, the full df if it is small enough
+    """
+    if len(df) <= sample_size:
+        return df
+
+    strata = pd.qcut(df[target].rank(method="first"), num_strata, labels=False)
+    fraction = sample_size / len(df)
+
+    return df.groupby(strata, group_keys=False).sample(frac=fraction, random_state=seed)
+
+
+def pearson_scores(features: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """
+    Purpose:
+        Pearson correlation of every feature with the target in one pass
+    Args:
+        features - n x m matrix of features
+        target - n values of the target
+    Returns:
+        scores - m correlations, 0 for constant columns
+    """
+    features = features - features.mean(axis=0)
+    target = target - target.mean()
+
+    norms = np.sqrt((features ** 2).sum(axis=0) * (target ** 2).sum())
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = features.T @ target / norms
+
+    return np.nan_to_num(scores)
+
+
+class CorrelationEngine:
+    def __init__(
+        self,
+        method: str = "pearson",
+        sample_size: int = 5000,
+        cache_size: int = 32,
+        seed: int = 0,
+    ):
+        """
+        Purpose:
+            Init CorrelationEngine Class
+        Args:
+            method: "pearson" or "mutual_info-regression"
+            sample_size: most rows to compute on, None for all rows
+            cache_size: number of results to keep
+            seed: random seed for sampling and mutual information
+        Returns:
+            CorrelationEngine class
+        """
+
+        if method not in METHODS:
+            raise ValueError(f"Method must be one of {METHODS}")
+
+        self.method = method
+        self.sample_size = sample_size
+        self.seed = seed
+        self.cache = ResultCache(cache_size)
+
+    def compute(
+        self,
+        df: pd.DataFrame,
+        target: str = "algo_score",
+        method: str = None,
+        sample_size: int = None,
+    ) -> pd.Series:
+        """
+        Purpose:
+            Get the correlation of each feature with the target, cached by
+            the content of the df
+        Args:
+            df - Pandas dataframe from process_tweets
+            target - the target column
+            method - overrides the engine method
+            sample_size - overrides the engine sample size
+        Returns:
+            scores - correlation per feature, sorted ascending like yellowbrick
+        """
+        method = method or self.method
+        sample_size = sample_size or self.sample_size
+
+        if method not in METHODS:
+            raise ValueError(f"Method must be one of {METHODS}")
+
+        feature_cols = get_feature_cols(df, target)
+        frame = df[feature_cols + [target]]
+
+        key = (hash_frame(frame), target, method, sample_size)
+        scores = self.cache.get(key)
+        if scores is not MISSING:
+            return scores
+
+        if sample_size:
+            frame = stratified_sample(frame, target, sample_size, seed=self.seed)
+
+        features = frame[feature_cols].to_numpy(dtype=float)
+        target_values = frame[target].to_numpy(dtype=float)
+
+        if method == "pearson":
+            values = pearson_scores(features, target_values)
+        else:
+            from sklearn.feature_selection import mutual_info_regression
+
+            values = mutual_info_regression(
+                features, target_values, random_state=self.seed
+            )
+
+        scores = pd.Series(values, index=feature_cols).sort_values(kind="stable")
+        self.cache.put(key, scores)
+
+        return scores
+
+
+def plot_correlation(scores: pd.Series, method: str = "pearson"):
+    """
+    Purpose:
+        Plot precomputed correlation scores with yellowbrick
+    Args:
+        scores - correlation per feature, from CorrelationEngine.compute
+        method - method the scores were computed with, for the axis label
+    Returns:
+        viz - the yellowbrick FeatureCorrelation visualizer, drawn
+    """
+    from yellowbrick.target import FeatureCorrelation
+
+    viz = FeatureCorrelation(method=method, labels=list(scores.index))
+    viz.features_ = np.array(scores.index)
+    viz.scores_ = scores.to_numpy()
+    viz.draw()
+
+    return viz
@@ -0,0 +1,235 @@
+"""
+Purpose:
+    This file contains the classes for Evaluator and Evaluation, which score
+    several algorithms on the same tweets in one pass
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import share_features
+from .function import Function
+
+
+class Evaluation:
+    def __init__(
+        self,
+        algos: List[Any],
+        raw: Dict[Any, np.ndarray],
+        keys: Dict[str, List[Any]],
+        twitter_urls: List[str],
+    ):
+        """
+        Purpose:
+            Init Evaluation Class, the scores of several algorithms on the
+            same tweets
+        Args:
+            algos: the Algorithms, in the order given to the Evaluator
+            raw: unweighted scores of each distinct function by run key
+            keys: run key of each weighted function, by algo name
+            twitter_urls: url of each tweet
+        Returns:
+            Evaluation class
+        """
+
+        self.algos = {algo.name: algo for algo in algos}
+        self.raw = raw
+        self.keys = keys
+        self.twitter_urls = twitter_urls
+
+        self.columns = {name: self._score_columns(name) for name in self.algos}
+
+    def _score_columns(self, algo_name: str) -> Dict[str, np.ndarray]:
+        """
+        Purpose:
+            Weight and add up the shared scores for one algo
+        Args:
+            algo_name: name of the algo
+        Returns:
+            columns - weighted scores per function name, plus the algo_score
+        """
+
+        columns = {}
+        algo_score = np.zeros(len(self.twitter_urls))  # The score for the algo
+
+        # Add up in function order, so the scores match score_columns
+        for func, key in zip(self.algos[algo_name].functions, self.keys[algo_name]):
+            curr_values = self.raw[key] * func.weight
+            columns[func.get_name()] = curr_values
+
+            algo_score = algo_score + curr_values
+
+        columns["algo_score"] = algo_score
+
+        return columns
+
+    def scores(self) -> pd.DataFrame:
+        """
+        Purpose:
+            Get the algo_score of every algo, in timeline order
+        Args:
+            N/A
+        Returns:
+            df: one column per algo, plus the twitter_url
+        """
+
+        df = pd.DataFrame(
+            {name: columns["algo_score"] for name, columns in self.columns.items()}
+        )
+        df["twitter_url"] = self.twitter_urls
+
+        return df
+
+    def ranks(self) -> pd.DataFrame:
+        """
+        Purpose:
+            Get the rank of every tweet under every algo, 1 is the top. Ties
+            keep timeline order, like process_tweets
+        Args:
+            N/A
+        Returns:
+            df: one column per algo, plus the twitter_url
+        """
+
+        ranks = {}
+
+        for name, columns in self.columns.items():
+            order = np.argsort(-columns["algo_score"], kind="stable")
+            rank = np.empty(len(order), dtype=int)
+            rank[order] = np.arange(1, len(order) + 1)
+            ranks[name] = rank
+
+        df = pd.DataFrame(ranks)
+        df["twitter_url"] = self.twitter_urls
+
+        return df
+
+    def get_df(self, algo_name: str) -> pd.DataFrame:
+        """
+        Purpose:
+            Get the ranking of one algo
+        Args:
+            algo_name: name of the algo
+        Returns:
+            algo_tweets - the same df as process_tweets for the algo
+        """
+
+        columns = dict(self.columns[algo_name])
+        columns["twitter_url"] = self.twitter_urls
+
+        df = pd.DataFrame(columns)
+
+        return df.sort_values(by=["algo_score"], ascending=False, kind="stable")
+
+    def side_by_side(self, top_k: int = None) -> pd.DataFrame:
+        """
+        Purpose:
+            Get the rankings of all the algos next to each other
+        Args:
+            top_k: number of ranks to keep, None for all
+        Returns:
+            df: the twitter_url at each rank, one column per algo
+        """
+
+        ranked = {}
+
+        for name, columns in self.columns.items():
+            order = np.argsort(-columns["algo_score"], kind="stable")[:top_k]
+            ranked[name] = [self.twitter_urls[index] for index in order]
+
+        df = pd.DataFrame(ranked)
+        df.index = pd.RangeIndex(1, len(df) + 1, name="rank")
+
+        return df
+
+
+class Evaluator:
+    def __init__(self, algos: List[Any]):
+        """
+        Purpose:
+            Init Evaluator Class. Deterministic functions used by several
+            algos (or under several weights) are run once per tweet, other
+            functions are run for every weighted function like in
+            process_tweets
+        Args:
+            algos: the Algorithms to compare, with unique names
+        Returns:
+            Evaluator class
+        """
+
+        names = [algo.name for algo in algos]
+        if len(set(names)) != len(names):
+            raise ValueError("Algorithms must have unique names")
+
+        self.algos = algos
+
+        # Distinct functions to run, and the run key of each weighted function
+        self.functions: Dict[Any, Function] = {}
+        self.keys: Dict[str, List[Any]] = {}
+
+        for algo in algos:
+            self.keys[algo.name] = []
+
+            for position, func in enumerate(algo.functions):
+                key = self._get_run_key(algo, position)
+                self.functions.setdefault(key, func.func)
+                self.keys[algo.name].append(key)
+
+    def _get_run_key(self, algo: Any, position: int) -> Tuple:
+        """
+        Purpose:
+            Get the key that decides which weighted functions share a run
+        Args:
+            algo: the Algorithm
+            position: position of the weighted function in the algo
+        Returns:
+            key: code key for deterministic functions, else unique per
+                weighted function
+        """
+        func = algo.functions[position].func
+
+        if func.deterministic:
+            return ("code", func.get_key())
+
+        return ("algo", algo.name, position)
+
+    def num_runs(self) -> int:
+        """
+        Purpose:
+            Get the number of function runs per tweet
+        Args:
+            N/A
+        Returns:
+            number of distinct functions
+        """
+        return len(self.functions)
+
+    def evaluate(self, tweets: List[Dict[str, Any]]) -> Evaluation:
+        """
+        Purpose:
+            Score the tweets with every algo, running each distinct function
+            once on the whole list
+        Args:
+            tweets - List of tweets
+        Returns:
+            evaluation - Evaluation with the scores and ranks of every algo
+        """
+
+        raw = {}
+
+        # Functions that use features share them across all the algos
+        shared = tweets
+        if any(function.uses_features for function in self.functions.values()):
+            shared = share_features(tweets)
+
+        for key, function in self.functions.items():
+            raw[key] = function.run_batch(shared)
+
+        return Evaluation(
+            self.algos,
+            raw,
+            self.keys,
+            [tweet["twitter_url"] for tweet in tweets],
+        )
@@ -0,0 +1,178 @@
+"""
+Purpose:
+    This file contains the classes for TweetFeatures, a tweet with derived
+    features computed on first use, and FeatureList, which shares them
+    across all the functions of an algorithm
+"""
+
+from collections.abc import Mapping, Sequence
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Union
+import re
+
+from .sentiment import get_engine
+
+RE_URL = re.compile(r"https?://\S+")
+RE_MENTION = re.compile(r"@(\w+)")
+RE_HASHTAG = re.compile(r"#(\w+)")
+RE_WHITESPACE = re.compile(r"\s+")
+RE_WORD = re.compile(r"\w+(?:'\w+)?")
+
+
+class TweetFeatures(Mapping):
+    def __init__(self, tweet: Dict[str, Any]):
+        """
+        Purpose:
+            Init TweetFeatures Class. Reads like the tweet dict, and has
+            derived features as attributes that are computed the first time
+            they are read
+        Args:
+            tweet: tweet JSON or a TweetRow
+        Returns:
+            TweetFeatures class
+        """
+        self.tweet = tweet
+
+    def __getitem__(self, key: str) -> Any:
+        return self.tweet[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tweet)
+
+    def __len__(self) -> int:
+        return len(self.tweet)
+
+    def __repr__(self) -> str:
+        return f"TweetFeatures({self.tweet.get('id_str')})"
+
+    @cached_property
+    def text(self) -> str:
+        """The full_text, empty if missing"""
+        return self.tweet.get("full_text") or ""
+
+    @cached_property
+    def normalized_text(self) -> str:
+        """Lower cased text without urls and mentions, spaces collapsed"""
+        text = RE_MENTION.sub(" ", RE_URL.sub(" ", self.text))
+        return RE_WHITESPACE.sub(" ", text).strip().lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Words of the normalized text"""
+        return RE_WORD.findall(self.normalized_text)
+
+    @cached_property
+    def urls(self) -> List[str]:
+        """Urls in the text"""
+        return RE_URL.findall(self.text)
+
+    @cached_property
+    def mentions(self) -> List[str]:
+        """Screen names mentioned in the text, without the @"""
+        return RE_MENTION.findall(self.text)
+
+    @cached_property
+    def hashtags(self) -> List[str]:
+        """Hashtags in the text, without the #"""
+        return RE_HASHTAG.findall(self.text)
+
+    @cached_property
+    def lang(self) -> str:
+        """Language Twitter detected, "und" if missing"""
+        return self.tweet.get("lang") or "und"
+
+    @cached_property
+    def blob(self) -> Any:
+        """TextBlob of the text"""
+        from textblob import TextBlob
+
+        return TextBlob(self.text)
+
+    @cached_property
+    def polarity(self) -> float:
+        """Sentiment polarity of the text from the shared SentimentEngine"""
+        return get_engine().polarity(self.text)
+
+
+class FeatureList(Sequence):
+    def __init__(self, tweets: List[Dict[str, Any]]):
+        """
+        Purpose:
+            Init FeatureList Class, a list of the TweetFeatures of some
+            tweets. Each TweetFeatures is made once, on first use, so
+            every function reading it shares its features
+        Args:
+            tweets: list of tweets
+        Returns:
+            FeatureList class
+        """
+        self.tweets = tweets
+        self._features = [None] * len(tweets)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[TweetFeatures, List[TweetFeatures]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        features = self._features[index]
+        if features is None:
+            features = self._features[index] = TweetFeatures(self.tweets[index])
+
+        return features
+
+
+def share_features(tweets: List[Dict[str, Any]]) -> FeatureList:
+    """
+    Purpose:
+        Wrap a batch once so functions that use features share them
+    Args:
+        tweets: list of tweets, or a FeatureList
+    Returns:
+        feature_list: FeatureList of the tweets
+    """
+    if isinstance(tweets, FeatureList):
+        return tweets
+
+    return FeatureList(tweets)
+
+
+def as_features(tweets: List[Any]) -> List[TweetFeatures]:
+    """
+    Purpose:
+        Get the tweets as TweetFeatures for a function that uses features,
+        reusing the ones already made
+    Args:
+        tweets: list of tweets, TweetFeatures or a FeatureList
+    Returns:
+        features: list-like of TweetFeatures
+    """
+    if isinstance(tweets, FeatureList):
+        return tweets
+
+    return [
+        tweet if isinstance(tweet, TweetFeatures) else TweetFeatures(tweet)
+        for tweet in tweets
+    ]
+
+
+def as_tweets(tweets: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Purpose:
+        Get the plain tweets back for a function that does not use features
+    Args:
+        tweets: list of tweets, TweetFeatures or a FeatureList
+    Returns:
+        tweets: the tweets as they were before being wrapped
+    """
+    if isinstance(tweets, FeatureList):
+        return tweets.tweets
+
+    # Lists are either all plain tweets or all TweetFeatures
+    if len(tweets) and isinstance(tweets[0], TweetFeatures):
+        return [tweet.tweet for tweet in tweets]
+
+    return tweets
@@ -0,0 +1,275 @@
+"""
+Purpose:
+    This file contains the classes for TokenBucket and TimelineFetcher
+"""
+
+from typing import Any, Callable, Dict, Iterator, List
+import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TWITTER_API_URL = "https://api.twitter.com/1.1"
+
+# Most tweets the home_timeline endpoint returns per page
+MAX_PAGE_SIZE = 200
+
+# home_timeline allows 15 requests per 15 minute window
+DEFAULT_RATE = 15 / 900
+DEFAULT_CAPACITY = 15
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        capacity: float = DEFAULT_CAPACITY,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Purpose:
+            Init TokenBucket Class, schedules requests under the rate limit
+        Args:
+            rate: tokens added per second
+            capacity: most tokens the bucket holds
+            clock: returns the current time in seconds
+            sleep: waits the given seconds
+        Returns:
+            TokenBucket class
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """
+        Purpose:
+            Wait until a request is allowed, then take a token
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        wait = self.blocked_until - self.clock()
+        if wait > 0:
+            self.sleep(wait)
+
+        self._refill()
+        if self.tokens < 1:
+            self.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+
+        self.tokens -= 1
+
+    def update_from_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Purpose:
+            Sync the bucket with the x-rate-limit headers of a response
+        Args:
+            headers: response headers
+        Returns:
+            N/A
+        """
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+
+        if remaining is None:
+            return
+
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+        if float(remaining) < 1 and reset is not None:
+            self.block_until(float(reset))
+
+    def block_until(self, timestamp: float) -> None:
+        """
+        Purpose:
+            Hold all requests until a time, e.g. the rate limit reset
+        Args:
+            timestamp: unix time to wait for
+        Returns:
+            N/A
+        """
+        self.blocked_until = max(self.blocked_until, timestamp)
+
+
+class TimelineFetcher:
+    def __init__(
+        self,
+        auth: Any = None,
+        base_url: str = TWITTER_API_URL,
+        bucket: TokenBucket = None,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+    ):
+        """
+        Purpose:
+            Init TimelineFetcher Class, keeps one pooled session for all requests
+        Args:
+            auth: requests auth for the API, e.g. from make_oauth
+            base_url: API url, can point at a local server for testing
+            bucket: TokenBucket used to schedule requests
+            max_retries: times to retry a page that got a 429
+            backoff: seconds to wait on the first 429 without a reset header,
+                doubled on every retry
+            timeout: seconds to wait for a response
+        Returns:
+            TimelineFetcher class
+        """
+
+        self.base_url = base_url.rstrip("/")
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=4))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=4))
+
+    def close(self) -> None:
+        """
+        Purpose:
+            Close the pooled session
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self.session.close()
+
+    def get_page(
+        self, count: int, max_id: int = None, since_id: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Get one page of the home timeline, backing off on 429
+        Args:
+            count: number of tweets to ask for
+            max_id: only get tweets with an id at or below this
+            since_id: only get tweets with an id above this
+        Returns:
+            page: tweet JSON dicts, newest first
+        """
+
+        params = {
+            "count": min(count, MAX_PAGE_SIZE),
+            "tweet_mode": "extended",
+            "contributor_details": "true",
+        }
+        if max_id is not None:
+            params["max_id"] = max_id
+        if since_id is not None:
+            params["since_id"] = since_id
+
+        url = f"{self.base_url}/statuses/home_timeline.json"
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            self.bucket.update_from_headers(response.headers)
+
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response.json()
+
+            reset = response.headers.get("x-rate-limit-reset")
+            retry_after = response.headers.get("retry-after")
+
+            if reset is not None:
+                self.bucket.block_until(float(reset))
+            elif retry_after is not None:
+                self.bucket.block_until(self.bucket.clock() + float(retry_after))
+            else:
+                self.bucket.block_until(
+                    self.bucket.clock() + self.backoff * 2 ** attempt
+                )
+
+            logging.warning(f"Rate limited, retry {attempt + 1} of {self.max_retries}")
+
+        raise RuntimeError("Rate limited, out of retries")
+
+    def iter_tweets(
+        self, num_tweets: int, since_id: int = None, max_id: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Purpose:
+            Walk the max_id cursor to get tweets across pages
+        Args:
+            num_tweets: number of tweets to get
+            since_id: only get tweets newer than this id
+            max_id: only get tweets with an id at or below this
+        Returns:
+            generator of tweet JSON with a twitter_url, newest first
+        """
+
+        fetched = 0
+
+        while fetched < num_tweets:
+            page = self.get_page(num_tweets - fetched, max_id=max_id, since_id=since_id)
+            if not page:
+                return
+
+            for tweet in page[: num_tweets - fetched]:
+                username = tweet["user"]["screen_name"]  # Username vlaue
+                id_str = tweet["id_str"]  # id str
+
+                # Get the twitter url
+                tweet["twitter_url"] = f"https://twitter.com/{username}/status/{id_str}"
+
+                fetched += 1
+                yield tweet
+
+            # Next page is everything older than this one
+            max_id = min(int(tweet["id_str"]) for tweet in page) - 1
+
+    def fetch(
+        self, num_tweets: int, since_id: int = None, max_id: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Get tweets from the home timeline across pages
+        Args:
+            num_tweets: number of tweets to get
+            since_id: only get tweets newer than this id
+            max_id: only get tweets with an id at or below this
+        Returns:
+            tweets from timeline
+        """
+        return list(self.iter_tweets(num_tweets, since_id=since_id, max_id=max_id))
+
+
+def make_oauth(
+    consumer_key: str, consumer_secret: str, access_token_key: str, access_token_secret: str
+) -> Any:
+    """
+    Purpose:
+        Make the OAuth1 auth for the Twitter API
+    Args:
+        consumer_key: consumer key
+        consumer_secret: consumer secret
+        access_token_key: access token key
+        access_token_secret: access token secret
+    Returns:
+        auth: requests auth object
+    """
+    # requests_oauthlib comes with python-twitter
+    from requests_oauthlib import OAuth1
+
+    return OAuth1(consumer_key, consumer_secret, access_token_key, access_token_secret)
@@ -3,13 +3,55 @@ Purpose:
     This file contains the class for Function
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
+import asyncio
 import numbers
 import types
+import weakref
+
+import numpy as np
+
+from .features import TweetFeatures, as_features, as_tweets
+
+
+class FunctionError(RuntimeError):
+    def __init__(self, error: Any, name: str = None, index: int = None):
+        """
+        Purpose:
+            Error raised when a Function fails while scoring tweets
+        Args:
+            error: the underlying error
+            name: Name of the function that failed
+            index: position of the failing tweet in the list, None if unknown
+        Returns:
+            FunctionError class
+        """
+        super().__init__(error)
+        self.name = name
+        self.index = index
 
 
 class Function:
-    def __init__(self, name: str, desc: str, code: types.FunctionType):
+    # Defaults for Functions pickled before these attributes existed
+    batch_code = None
+    deterministic = False
+    is_async = False
+    max_concurrency = 16
+    timeout = None
+    uses_features = False
+
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        code: types.FunctionType,
+        batch_code: types.FunctionType = None,
+        deterministic: bool = False,
+        is_async: bool = None,
+        max_concurrency: int = 16,
+        timeout: float = None,
+        uses_features: bool = False,
+    ):
         """
         Purpose:
             Init Function Class
@@ -17,6 +59,18 @@ class Function:
             name: Name of function
             desc: description of function
             code: code of the function
+            batch_code: optional code that scores a list of tweets in one call
+                and returns one number per tweet
+            deterministic: True if the code always gives the same result for
+                the same tweet, so its results can be shared and cached
+            is_async: True if the code is a coroutine function, None checks
+                the code
+            max_concurrency: most calls of async code running at once
+            timeout: seconds to wait for one call of async code, None for
+                no limit
+            uses_features: True if the code takes a TweetFeatures, with
+                derived features shared by all the functions of an
+                algorithm, instead of the tweet dict
         Returns:
             Function class
         """
@@ -27,7 +81,69 @@ class Function:
         if not callable(code):
             raise ValueError("Code must be a function")
 
+        if batch_code is not None and not callable(batch_code):
+            raise ValueError("Batch code must be a function")
+
+        if is_async is None:
+            is_async = asyncio.iscoroutinefunction(code)
+
+        if is_async and batch_code is not None:
+            raise ValueError("Async functions can not have batch code")
+
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+
         self.code = code
+        self.batch_code = batch_code
+        self.deterministic = deterministic
+        self.is_async = is_async
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.uses_features = uses_features
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Semaphores belong to an event loop and are not saved
+        state = self.__dict__.copy()
+        state.pop("_semaphores", None)
+        return state
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Purpose:
+            Get the semaphore that limits the calls of async code, shared by
+            every run of this Function in the running event loop
+        Args:
+            N/A
+        Returns:
+            semaphore: Semaphore allowing max_concurrency calls at once
+        """
+        semaphores = self.__dict__.setdefault(
+            "_semaphores", weakref.WeakKeyDictionary()
+        )
+        loop = asyncio.get_running_loop()
+
+        if loop not in semaphores:
+            semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        return semaphores[loop]
+
+    def get_key(self) -> str:
+        """
+        Purpose:
+            Get the identity of the code, Functions wrapping the same code share it
+        Args:
+            N/A
+        Returns:
+            key: import path of the code, or its id if it can not be imported
+        """
+        module = getattr(self.code, "__module__", None)
+        qualname = getattr(self.code, "__qualname__", None)
+
+        # lambdas and nested functions do not have a unique import path
+        if not module or not qualname or "<" in qualname:
+            return f"id:{id(self.code)}"
+
+        return f"{module}.{qualname}"
 
     def run_code(self, tweet: Dict[str, Any]) -> int:
         """
@@ -38,12 +154,66 @@ class Function:
         Returns:
             result: number betwen 0 - 100 on how high the tweet should show on the feed
         """
+        if self.is_async:
+            # Outside of an event loop async code runs in a loop of its own
+            return asyncio.run(self.run_code_async(tweet))
+
+        tweet = self._get_input(tweet)
+
         try:
             result = self.code(tweet)
             # print(self.code)
         except Exception as error:
             raise RuntimeError(error)
 
+        return self._check_result(result)
+
+    async def run_code_async(self, tweet: Dict[str, Any]) -> int:
+        """
+        Purpose:
+            Run the code for the algorithm, awaiting it if it is async
+        Args:
+            tweet: The tweet data to run the algorithm on
+        Returns:
+            result: number betwen 0 - 100 on how high the tweet should show on the feed
+        """
+        if not self.is_async:
+            return self.run_code(tweet)
+
+        tweet = self._get_input(tweet)
+
+        try:
+            result = await asyncio.wait_for(self.code(tweet), self.timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timed out after {self.timeout} seconds")
+        except Exception as error:
+            raise RuntimeError(error)
+
+        return self._check_result(result)
+
+    def _get_input(self, tweet: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get what the code takes for one tweet
+        Args:
+            tweet: the tweet, or its TweetFeatures
+        Returns:
+            tweet: TweetFeatures if the code uses features, else the tweet
+        """
+        if isinstance(tweet, TweetFeatures):
+            return tweet if self.uses_features else tweet.tweet
+
+        return TweetFeatures(tweet) if self.uses_features else tweet
+
+    def _check_result(self, result: Any) -> int:
+        """
+        Purpose:
+            Check the code returned a number in range
+        Args:
+            result: what the code returned
+        Returns:
+            result: the number
+        """
         if not (isinstance(result, numbers.Number)):
             print(result)
             raise ValueError("Function must return a number")
@@ -53,3 +223,98 @@ class Function:
             raise ValueError("Function must return a number between -100 and 100")
 
         return result
+
+    def run_batch(self, tweets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Purpose:
+            Run the code for the algorithm on a list of tweets. Uses the
+            batch code when there is one, else runs the code per tweet
+        Args:
+            tweets: The list of tweets to run the algorithm on
+        Returns:
+            results: array with one number betwen -100 - 100 per tweet
+        """
+        if self.is_async:
+            # Outside of an event loop async code runs in a loop of its own
+            return asyncio.run(self.run_batch_async(tweets))
+
+        # Functions sharing a batch share its TweetFeatures
+        tweets = as_features(tweets) if self.uses_features else as_tweets(tweets)
+
+        if self.batch_code is None:
+            results = np.empty(len(tweets))
+
+            for index, tweet in enumerate(tweets):
+                try:
+                    results[index] = self.run_code(tweet)
+                except Exception as error:
+                    raise FunctionError(error, self.name, index)
+
+            return results
+
+        try:
+            results = self.batch_code(tweets)
+        except Exception as error:
+            raise FunctionError(error, self.name)
+
+        try:
+            results = np.asarray(results, dtype=float)
+        except (TypeError, ValueError):
+            raise FunctionError("Function must return a number", self.name)
+
+        if results.shape != (len(tweets),):
+            raise FunctionError(
+                "Batch function must return one number per tweet", self.name
+            )
+
+        out_of_range = ~((results >= -100) & (results <= 100))
+        if out_of_range.any():
+            index = int(np.argmax(out_of_range))
+            raise FunctionError(
+                "Function must return a number between -100 and 100",
+                self.name,
+                index,
+            )
+
+        return results
+
+    async def run_batch_async(self, tweets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Purpose:
+            Run the code for the algorithm on a list of tweets. Async code
+            runs concurrently, at most max_concurrency calls of this Function
+            at once across all its runs in the event loop, sync
+            code runs inline like run_batch
+        Args:
+            tweets: The list of tweets to run the algorithm on
+        Returns:
+            results: array with one number betwen -100 - 100 per tweet
+        """
+        if not self.is_async:
+            return self.run_batch(tweets)
+
+        results = np.empty(len(tweets))
+
+        # Shared with other runs, e.g. the same Function under several weights
+        semaphore = self.get_semaphore()
+
+        async def run_one(index: int, tweet: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    results[index] = await self.run_code_async(tweet)
+                except Exception as error:
+                    raise FunctionError(error, self.name, index)
+
+        tasks = [
+            asyncio.ensure_future(run_one(index, tweet))
+            for index, tweet in enumerate(tweets)
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Stop the other calls once one fails
+            for task in tasks:
+                task.cancel()
+
+        return results
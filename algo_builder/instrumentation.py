@@ -0,0 +1,207 @@
+"""
+Purpose:
+    This file contains the classes for profiling the functions of an Algorithm
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List
+import time
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ScoringHook(ABC):
+    @abstractmethod
+    def on_start(self, name: str, num_tweets: int) -> None:
+        """
+        Purpose:
+            Called before a weighted function scores a batch of tweets
+        Args:
+            name: name of the weighted function
+            num_tweets: number of tweets in the batch
+        Returns:
+            N/A
+        """
+        pass
+
+    @abstractmethod
+    def on_end(
+        self, name: str, num_tweets: int, elapsed: float, error: Exception = None
+    ) -> None:
+        """
+        Purpose:
+            Called after a weighted function scores a batch of tweets
+        Args:
+            name: name of the weighted function
+            num_tweets: number of tweets in the batch
+            elapsed: wall time in seconds
+            error: the error raised, None on success
+        Returns:
+            N/A
+        """
+        pass
+
+
+class FunctionStats:
+    def __init__(self, name: str):
+        """
+        Purpose:
+            Init FunctionStats Class, the counters for one weighted function
+        Args:
+            name: name of the weighted function
+        Returns:
+            FunctionStats class
+        """
+
+        self.name = name
+        self.calls = 0
+        self.tweets = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, num_tweets: int, elapsed: float, error: Exception = None) -> None:
+        """
+        Purpose:
+            Add one call to the counters
+        Args:
+            num_tweets: number of tweets in the call
+            elapsed: wall time in seconds
+            error: the error raised, None on success
+        Returns:
+            N/A
+        """
+        self.calls += 1
+        self.tweets += num_tweets
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+        if error is not None:
+            self.errors += 1
+
+
+class Instrumentation:
+    def __init__(self, hooks: List[ScoringHook] = None):
+        """
+        Purpose:
+            Init Instrumentation Class, times every weighted function call
+            and passes it on to the hooks
+        Args:
+            hooks: ScoringHooks to call, e.g. to send metrics somewhere
+        Returns:
+            Instrumentation class
+        """
+
+        self.hooks = list(hooks or [])
+        self.stats = {}
+
+    def add_hook(self, hook: ScoringHook) -> None:
+        """
+        Purpose:
+            Add a hook
+        Args:
+            hook: the ScoringHook
+        Returns:
+            N/A
+        """
+        self.hooks.append(hook)
+
+    def reset(self) -> None:
+        """
+        Purpose:
+            Clear the counters
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self.stats = {}
+
+    @contextmanager
+    def measure(self, name: str, num_tweets: int) -> Iterator[None]:
+        """
+        Purpose:
+            Time the code in the with block as one call of a function
+        Args:
+            name: name of the weighted function
+            num_tweets: number of tweets in the call
+        Returns:
+            N/A
+        """
+        if name not in self.stats:
+            self.stats[name] = FunctionStats(name)
+
+        for hook in self.hooks:
+            hook.on_start(name, num_tweets)
+
+        error = None
+        start = time.perf_counter()
+
+        try:
+            yield
+        except Exception as raised:
+            error = raised
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats[name].record(num_tweets, elapsed, error)
+
+            for hook in self.hooks:
+                hook.on_end(name, num_tweets, elapsed, error)
+
+    def record_errors(self, name: str, num_errors: int) -> None:
+        """
+        Purpose:
+            Count errors that were handled inside a call, e.g. the failed
+            tweets of process_tweets_safe
+        Args:
+            name: name of the weighted function
+            num_errors: number of errors
+        Returns:
+            N/A
+        """
+        if name not in self.stats:
+            self.stats[name] = FunctionStats(name)
+
+        self.stats[name].errors += num_errors
+
+    def summary(self) -> "pd.DataFrame":
+        """
+        Purpose:
+            Get the counters as a df, slowest function first
+        Args:
+            N/A
+        Returns:
+            df: one row per weighted function
+        """
+        import pandas as pd
+
+        columns = [
+            "function",
+            "calls",
+            "tweets",
+            "errors",
+            "total_ms",
+            "max_ms",
+            "ms_per_tweet",
+        ]
+
+        rows = []
+        for stats in self.stats.values():
+            rows.append(
+                {
+                    "function": stats.name,
+                    "calls": stats.calls,
+                    "tweets": stats.tweets,
+                    "errors": stats.errors,
+                    "total_ms": stats.total_time * 1000,
+                    "max_ms": stats.max_time * 1000,
+                    "ms_per_tweet": stats.total_time * 1000 / max(stats.tweets, 1),
+                }
+            )
+
+        df = pd.DataFrame(rows, columns=columns)
+
+        return df.sort_values(by=["total_ms"], ascending=False, kind="stable")
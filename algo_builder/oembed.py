@@ -0,0 +1,154 @@
+"""
+Purpose:
+    This file contains the class for OEmbedClient
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+import hashlib
+import logging
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import utils
+
+OEMBED_URL = "https://publish.twitter.com/oembed"
+
+
+class OEmbedClient:
+    def __init__(
+        self,
+        endpoint: str = OEMBED_URL,
+        cache_dir: str = ".oembed_cache",
+        ttl: float = 24 * 60 * 60,
+        max_in_flight: int = 8,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Purpose:
+            Init OEmbedClient Class, gets tweet embed html concurrently with a
+            pooled session and keeps it in an on disk cache
+        Args:
+            endpoint: oEmbed API url, can point at a local server for testing
+            cache_dir: folder for the cache, None to not cache on disk
+            ttl: seconds a cached embed is used for
+            max_in_flight: most requests running at once
+            timeout: seconds to wait for a response
+            clock: returns the current time in seconds
+        Returns:
+            OEmbedClient class
+        """
+
+        self.endpoint = endpoint
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.clock = clock
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _cache_path(self, tweet_url: str) -> str:
+        key = hashlib.sha256(tweet_url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get_cached(self, tweet_url: str) -> str:
+        """
+        Purpose:
+            Get the embed html from the disk cache
+        Args:
+            tweet_url: url of the tweet
+        Returns:
+            html: the embed html, None if not cached or expired
+        """
+        if not self.cache_dir:
+            return None
+
+        cache_path = self._cache_path(tweet_url)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            cached = utils.load_json(cache_path)
+        except TypeError:
+            return None
+
+        if self.clock() - cached["fetched_at"] > self.ttl:
+            return None
+
+        return cached["html"]
+
+    def fetch(self, tweet_url: str) -> str:
+        """
+        Purpose:
+            Get the embed html of a tweet, from the cache if it is fresh
+        Args:
+            tweet_url: url of the tweet
+        Returns:
+            html: the embed html
+        """
+        html = self.get_cached(tweet_url)
+        if html is not None:
+            return html
+
+        return self._download(tweet_url)
+
+    def _download(self, tweet_url: str) -> str:
+        response = self.session.get(
+            self.endpoint, params={"url": tweet_url}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        html = response.json()["html"]
+
+        if self.cache_dir:
+            utils.save_json_atomic(
+                self._cache_path(tweet_url),
+                {"url": tweet_url, "fetched_at": self.clock(), "html": html},
+            )
+
+        return html
+
+    def _fetch_or_none(self, tweet_url: str) -> str:
+        try:
+            return self._download(tweet_url)
+        except Exception as error:
+            logging.error(f"Could not embed {tweet_url}: {error}")
+            return None
+
+    def fetch_many(self, tweet_urls: List[str]) -> Dict[str, str]:
+        """
+        Purpose:
+            Get the embed html of many tweets, at most max_in_flight at a time
+        Args:
+            tweet_urls: urls of the tweets
+        Returns:
+            embeds: html per url, None for tweets that failed
+        """
+        embeds = {}
+        missing = []
+
+        for tweet_url in dict.fromkeys(tweet_urls):
+            html = self.get_cached(tweet_url)
+            if html is None:
+                missing.append(tweet_url)
+            else:
+                embeds[tweet_url] = html
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                for tweet_url, html in zip(
+                    missing, executor.map(self._fetch_or_none, missing)
+                ):
+                    embeds[tweet_url] = html
+
+        return embeds
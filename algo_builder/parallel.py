@@ -0,0 +1,130 @@
+"""
+Purpose:
+    This file contains the process pool mode for scoring tweets
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+import math
+import pickle
+
+import numpy as np
+
+# The algorithm each worker process scores with, set once by the initializer
+_worker_algo = None
+
+
+class ChunkError(RuntimeError):
+    def __init__(self, failures: List[Dict[str, Any]]):
+        """
+        Purpose:
+            Error raised when one or more chunks fail in the process pool
+        Args:
+            failures: list of failures, each with start, end, index, function and error
+        Returns:
+            ChunkError class
+        """
+
+        lines = []
+        for failure in failures:
+            lines.append(
+                f"chunk [{failure['start']}, {failure['end']}) "
+                f"tweet {failure['index']} "
+                f"function {failure['function']}: {failure['error']}"
+            )
+
+        super().__init__("\n".join(lines))
+        self.failures = failures
+
+
+def _init_worker(algo_pickle: bytes) -> None:
+    """
+    Purpose:
+        Store the algorithm in the worker, so it is shipped once per worker
+    Args:
+        algo_pickle: the pickled Algorithm to score with
+    Returns:
+        N/A
+    """
+    global _worker_algo
+    _worker_algo = pickle.loads(algo_pickle)
+
+
+def _score_chunk(start: int, tweets: List[Dict[str, Any]]) -> Tuple[int, Any, Any]:
+    """
+    Purpose:
+        Score a chunk of tweets in a worker
+    Args:
+        start: position of the first tweet of the chunk in the full list
+        tweets: the chunk of tweets
+    Returns:
+        (start, columns, None) on success, (start, None, failure) on error
+    """
+    try:
+        return start, _worker_algo.score_columns(tweets), None
+    except Exception as error:
+        index = getattr(error, "index", None)
+
+        failure = {
+            "start": start,
+            "end": start + len(tweets),
+            "index": None if index is None else start + index,
+            "function": getattr(error, "name", None),
+            "error": str(error),
+        }
+
+        return start, None, failure
+
+
+def score_in_pool(
+    algo, tweets: List[Dict[str, Any]], workers: int, chunk_size: int = None
+) -> Dict[str, np.ndarray]:
+    """
+    Purpose:
+        Score the tweets across a process pool, results keep the original order
+    Args:
+        algo: the Algorithm to score with, must be picklable
+        tweets: List of tweets
+        workers: number of processes
+        chunk_size: number of tweets per chunk, defaults to 4 chunks per worker
+    Returns:
+        columns - weighted scores per function name, plus the algo_score
+    """
+
+    num_tweets = len(tweets)
+
+    if not chunk_size:
+        chunk_size = max(1, math.ceil(num_tweets / (workers * 4)))
+
+    chunk_columns = {}
+    failures = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(pickle.dumps(algo),)
+    ) as executor:
+        futures = [
+            executor.submit(_score_chunk, start, tweets[start : start + chunk_size])
+            for start in range(0, num_tweets, chunk_size)
+        ]
+
+        for future in futures:
+            start, columns, failure = future.result()
+
+            if failure:
+                failures.append(failure)
+            else:
+                chunk_columns[start] = columns
+
+    if failures:
+        raise ChunkError(failures)
+
+    if not chunk_columns:
+        return algo.score_columns(tweets)
+
+    # Put the chunks back together in the original order
+    ordered = [chunk_columns[start] for start in sorted(chunk_columns)]
+
+    return {
+        name: np.concatenate([columns[name] for columns in ordered])
+        for name in ordered[0]
+    }
@@ -0,0 +1,125 @@
+"""
+Purpose:
+    This file contains the class for IncrementalRanker
+"""
+
+from typing import Any, Dict, List, Tuple
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from .algorithm import Algorithm
+
+
+class IncrementalRanker:
+    def __init__(self, algo: Algorithm):
+        """
+        Purpose:
+            Init IncrementalRanker Class, keeps the scores of the last run so
+            polling the timeline only scores tweets it has not seen
+        Args:
+            algo: the Algorithm to rank with
+        Returns:
+            IncrementalRanker class
+        """
+
+        self.algo = algo
+        self.names = [func.get_name() for func in algo.functions]
+        self.scored = {}  # id_str -> (function values, algo_score, twitter_url)
+        self.order = []  # id_str sorted by the last ranking
+
+    def reset(self) -> None:
+        """
+        Purpose:
+            Forget all scored tweets
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self.scored = {}
+        self.order = []
+
+    def update(self, tweets: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Purpose:
+            Rank the current timeline, scoring only tweets with a new id_str,
+            dropping tweets that aged out and merging into the last order
+        Args:
+            tweets - List of tweets currently on the timeline
+        Returns:
+            algo_tweets - sorted tweets, same as process_tweets for
+                deterministic algorithms
+        """
+
+        positions = {}
+        new_tweets = []
+
+        for position, tweet in enumerate(tweets):
+            id_str = tweet["id_str"]
+            positions[id_str] = position
+
+            if id_str not in self.scored:
+                new_tweets.append(tweet)
+
+        # Drop tweets that aged out
+        self.scored = {
+            id_str: values
+            for id_str, values in self.scored.items()
+            if id_str in positions
+        }
+
+        def sort_key(id_str: str) -> Tuple[float, int]:
+            # Same order as the stable sort in process_tweets
+            return (-self.scored[id_str][1], positions[id_str])
+
+        # Survivors keep the last order, so this sort is close to linear
+        survivors = [id_str for id_str in self.order if id_str in self.scored]
+        survivors.sort(key=sort_key)
+
+        # Score only the new tweets
+        if new_tweets:
+            columns = self.algo.score_columns(new_tweets)
+
+            for index, tweet in enumerate(new_tweets):
+                self.scored[tweet["id_str"]] = (
+                    [columns[name][index] for name in self.names],
+                    float(columns["algo_score"][index]),
+                    tweet["twitter_url"],
+                )
+
+        new_ids = sorted((tweet["id_str"] for tweet in new_tweets), key=sort_key)
+
+        self.order = list(heapq.merge(survivors, new_ids, key=sort_key))
+
+        return self._to_df(positions)
+
+    def _to_df(self, positions: Dict[str, int]) -> pd.DataFrame:
+        """
+        Purpose:
+            Build a df shaped like process_tweets from the current order
+        Args:
+            positions - position of each id_str in the current timeline
+        Returns:
+            df - the ranked tweets indexed by timeline position
+        """
+
+        columns = {name: [] for name in self.names}
+        columns["algo_score"] = []
+        columns["twitter_url"] = []
+
+        for id_str in self.order:
+            values, algo_score, twitter_url = self.scored[id_str]
+
+            for name, value in zip(self.names, values):
+                columns[name].append(value)
+            columns["algo_score"].append(algo_score)
+            columns["twitter_url"].append(twitter_url)
+
+        for name in self.names + ["algo_score"]:
+            columns[name] = np.array(columns[name], dtype=float)
+
+        index = [positions[id_str] for id_str in self.order]
+
+        return pd.DataFrame(columns, index=index)
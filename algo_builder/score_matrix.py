@@ -0,0 +1,136 @@
+"""
+Purpose:
+    This file contains the class for ScoreMatrix, the unweighted function
+    scores of a timeline, to re-rank with new weights without running any
+    function code
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ScoreMatrix:
+    def __init__(
+        self,
+        names: List[str],
+        weights: List[float],
+        matrix: np.ndarray,
+        twitter_urls: List[str],
+    ):
+        """
+        Purpose:
+            Init ScoreMatrix Class
+        Args:
+            names: names of the weighted functions, in algorithm order
+            weights: weight of each weighted function
+            matrix: tweets x functions array of unweighted scores
+            twitter_urls: url of each tweet
+        Returns:
+            ScoreMatrix class
+        """
+
+        if matrix.shape != (len(twitter_urls), len(names)):
+            raise ValueError(
+                "Matrix must have one row per tweet and one column per function"
+            )
+
+        self.names = names
+        self.weights = np.asarray(weights, dtype=float)
+        self.matrix = matrix
+        self.twitter_urls = twitter_urls
+
+    def __len__(self) -> int:
+        return len(self.twitter_urls)
+
+    def get_weights(
+        self, weights: Union[List[float], Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Build a weight vector in function order
+        Args:
+            weights: one weight per function, or new weights by function
+                name, the rest keep the algorithm's weight. None for the
+                algorithm's weights
+        Returns:
+            weights: array with one weight per function
+        """
+        if weights is None:
+            return self.weights
+
+        if isinstance(weights, dict):
+            unknown = set(weights) - set(self.names)
+            if unknown:
+                raise ValueError(f"Unknown functions {sorted(unknown)}")
+
+            return np.array(
+                [
+                    weights.get(name, weight)
+                    for name, weight in zip(self.names, self.weights)
+                ],
+                dtype=float,
+            )
+
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (len(self.names),):
+            raise ValueError("Weights must have one weight per function")
+
+        return weights
+
+    def scores(
+        self, weights: Union[List[float], Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Get the algo_score of every tweet with a matrix vector product
+        Args:
+            weights: see get_weights
+        Returns:
+            algo_score: one score per tweet, in timeline order
+        """
+        return self.matrix @ self.get_weights(weights)
+
+    def rank_order(
+        self, weights: Union[List[float], Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Purpose:
+            Get the tweet positions from best to worst, ties keep timeline order
+        Args:
+            weights: see get_weights
+        Returns:
+            order: positions of the tweets
+        """
+        return np.argsort(-self.scores(weights), kind="stable")
+
+    def rerank(
+        self, weights: Union[List[float], Dict[str, float]] = None
+    ) -> "pd.DataFrame":
+        """
+        Purpose:
+            Rank the tweets with new weights, without running any function.
+            The matrix product adds up in a different order than
+            process_tweets, so scores can differ in the last bits
+        Args:
+            weights: see get_weights
+        Returns:
+            algo_tweets - sorted tweets, shaped like process_tweets
+        """
+        import pandas as pd
+
+        weights = self.get_weights(weights)
+        algo_score = self.matrix @ weights
+        order = np.argsort(-algo_score, kind="stable")
+
+        columns = {}
+        for position, (name, weight) in enumerate(zip(self.names, weights)):
+            columns[name] = self.matrix[order, position] * weight
+
+        columns["algo_score"] = algo_score[order]
+        columns["twitter_url"] = [self.twitter_urls[index] for index in order]
+
+        return pd.DataFrame(columns, index=order)
@@ -0,0 +1,99 @@
+"""
+Purpose:
+    This file contains the class for ScoringReport
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ScoringReport:
+    def __init__(
+        self,
+        names: List[str],
+        weights: List[float],
+        raw: Dict[str, np.ndarray],
+        twitter_urls: List[str],
+        failures: List[Dict[str, Any]],
+        fallback_score: float,
+    ):
+        """
+        Purpose:
+            Init ScoringReport Class, the partial result of a fault isolated run
+        Args:
+            names: names of the weighted functions, in algorithm order
+            weights: weight of each weighted function
+            raw: unweighted scores per weighted function name, failed cells
+                hold the fallback score
+            twitter_urls: url of each tweet
+            failures: one dict per failed (tweet, function) cell with index,
+                id_str, function and error
+            fallback_score: unweighted score used for failed cells
+        Returns:
+            ScoringReport class
+        """
+
+        self.names = names
+        self.weights = weights
+        self.raw = raw
+        self.twitter_urls = twitter_urls
+        self.failures = failures
+        self.fallback_score = fallback_score
+
+    @property
+    def ok(self) -> bool:
+        """
+        Purpose:
+            Check if every cell was scored
+        Args:
+            N/A
+        Returns:
+            True if there are no failures
+        """
+        return not self.failures
+
+    def to_df(self) -> "pd.DataFrame":
+        """
+        Purpose:
+            Build the ranking, like process_tweets but with fallback scores
+            in the failed cells
+        Args:
+            N/A
+        Returns:
+            algo_tweets - sorted tweets based on algo
+        """
+        import pandas as pd
+
+        columns = {}
+        algo_score = np.zeros(len(self.twitter_urls))
+
+        for name, weight in zip(self.names, self.weights):
+            curr_values = self.raw[name] * weight
+            columns[name] = curr_values
+            algo_score = algo_score + curr_values
+
+        columns["algo_score"] = algo_score
+        columns["twitter_url"] = self.twitter_urls
+
+        df = pd.DataFrame(columns)
+
+        return df.sort_values(by=["algo_score"], ascending=False, kind="stable")
+
+    def failure_df(self) -> "pd.DataFrame":
+        """
+        Purpose:
+            Get the failures as a df
+        Args:
+            N/A
+        Returns:
+            df: one row per failed cell
+        """
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.failures, columns=["index", "id_str", "function", "error"]
+        )
@@ -0,0 +1,398 @@
+"""
+Purpose:
+    This file contains the class for SentimentEngine, a batched port of the
+    TextBlob (pattern) polarity scorer.
+
+    The lexicon is read once from TextBlob's en-sentiment.xml into a flat
+    dict, and the tokenizer and word assessment follow pattern's rules
+    without building TextBlob, Sentence or namedtuple objects per text.
+    Polarity matches TextBlob(text).sentiment.polarity within POLARITY_TOLERANCE.
+    The only differences come from pattern splitting a text into sentences
+    before matching spaced out emoticons and "(!)", which this engine does on
+    the whole text.
+"""
+
+from typing import Dict, List, Tuple
+from xml.etree import ElementTree
+import hashlib
+import importlib.util
+import os
+import re
+
+import numpy as np
+
+from .cache import MISSING, ResultCache
+
+# Most the polarity differs from TextBlob, see the module docstring
+POLARITY_TOLERANCE = 0.05
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+
+# Leading and trailing punctuation split from words, periods handled alone
+SPLIT_PUNCTUATION = tuple(PUNCTUATION.replace(".", ""))
+TRAILING_PUNCTUATION = SPLIT_PUNCTUATION + (".",)
+
+# Contraction tokens that keep their leading quote
+CONTRACTIONS = frozenset(("'d", "'m", "'s", "'ll", "'re", "'ve", "n't"))
+
+ABBREVIATIONS = frozenset(
+    (
+        "a.",
+        "adj.",
+        "adv.",
+        "al.",
+        "a.m.",
+        "c.",
+        "cf.",
+        "comp.",
+        "conf.",
+        "def.",
+        "ed.",
+        "e.g.",
+        "esp.",
+        "etc.",
+        "ex.",
+        "f.",
+        "fig.",
+        "gen.",
+        "id.",
+        "i.e.",
+        "int.",
+        "l.",
+        "m.",
+        "Med.",
+        "Mil.",
+        "Mr.",
+        "n.",
+        "n.q.",
+        "orig.",
+        "pl.",
+        "pred.",
+        "pres.",
+        "p.m.",
+        "ref.",
+        "v.",
+        "vs.",
+        "w/",
+    )
+)
+
+RE_ABBR1 = re.compile(r"^[A-Za-z]\.$")
+RE_ABBR2 = re.compile(r"^([A-Za-z]\.)+$")
+RE_ABBR3 = re.compile("^[A-Z][" + "|".join("bcdfghjklmnpqrstvwxz") + "]+.$")
+
+EMOTICONS = {
+    +1.00: (
+        "<3",
+        "♥",
+        ">:D",
+        ":-D",
+        ":D",
+        "=-D",
+        "=D",
+        "X-D",
+        "x-D",
+        "XD",
+        "xD",
+        "8-D",
+    ),
+    +0.75: (">:P", ":-P", ":P", ":-p", ":p", ":-b", ":b", ":c)", ":o)", ":^)"),
+    +0.50: (">:)", ":-)", ":)", "=)", "=]", ":]", ":}", ":>", ":3", "8)", "8-)"),
+    +0.25: (">;]", ";-)", ";)", ";-]", ";]", ";D", ";^)", "*-)", "*)"),
+    +0.05: (">:o", ":-O", ":O", ":o", ":-o", "o_O", "o.O", "°O°", "°o°"),
+    -0.25: (">:/", ":-/", ":/", ":\\", ">:\\", ":-.", ":-s", ":s", ":S", ":-S", ">.>"),
+    -0.75: (">:[", ":-(", ":(", "=(", ":-[", ":[", ":{", ":-<", ":c", ":-c", "=/"),
+    -1.00: (":'(", ":'''(", ";'("),
+}
+
+# Lower cased emoticon -> polarity, the first match in EMOTICONS order wins
+EMOTICON_POLARITY = {}
+for _polarity, _emoticons in EMOTICONS.items():
+    for _emoticon in _emoticons:
+        EMOTICON_POLARITY.setdefault(_emoticon.lower(), _polarity)
+
+RE_CONTRACTIONS = re.compile(r"('d|'m|'s|'ll|'re|'ve|n't)")
+RE_LINEBREAK = re.compile(r"\n{2,}")
+RE_WHITESPACE = re.compile(r"\s+")
+RE_SARCASM = re.compile(r"\( ?\! ?\)")
+RE_EMOTICONS = re.compile(
+    r"(%s)($|\s)"
+    % "|".join(
+        r" ?".join(re.escape(char) for char in emoticon)
+        for emoticons in EMOTICONS.values()
+        for emoticon in emoticons
+    )
+)
+RE_RETWEET = re.compile(r"^RT @\w+: ")
+
+QUOTES = str.maketrans(
+    {"“": " “ ", "”": " ” ", "‘": " ‘ ", "’": " ’ ", "'": " ' ", '"': ' " '}
+)
+
+EOS = "END-OF-SENTENCE"
+
+
+def get_lexicon_path() -> str:
+    """
+    Purpose:
+        Find TextBlob's sentiment lexicon without importing TextBlob
+    Args:
+        N/A
+    Returns:
+        path: path of en-sentiment.xml
+    """
+    spec = importlib.util.find_spec("textblob")
+    if spec is None:
+        raise ImportError("textblob must be installed for its sentiment lexicon")
+
+    return os.path.join(spec.submodule_search_locations[0], "en", "en-sentiment.xml")
+
+
+def _avg(values: List[float]) -> float:
+    return sum(values) / float(len(values) or 1)
+
+
+def load_lexicon(path: str) -> Dict[str, Tuple[float, float, bool]]:
+    """
+    Purpose:
+        Load the lexicon the same way pattern does, flattened for lookups
+        of words without a part-of-speech tag
+    Args:
+        path: path of en-sentiment.xml
+    Returns:
+        lexicon: word -> (polarity, intensity, is adverb)
+    """
+    words = {}
+
+    for word in ElementTree.parse(path).getroot().findall("word"):
+        form = word.attrib.get("form")
+        if not form:
+            continue
+
+        scores = (
+            float(word.attrib.get("polarity", 0.0)),
+            float(word.attrib.get("subjectivity", 0.0)),
+            float(word.attrib.get("intensity", 1.0)),
+        )
+        words.setdefault(form, {}).setdefault(word.attrib.get("pos"), []).append(scores)
+
+    # Average all senses per tag, then all tags
+    for form in words:
+        words[form] = {
+            pos: [_avg(each) for each in zip(*scores)]
+            for pos, scores in words[form].items()
+        }
+    for form, tags in list(words.items()):
+        words[form][None] = [_avg(each) for each in zip(*tags.values())]
+
+    # Map "terrible" to adverb "terribly", like textblob.en.Sentiment
+    for form, tags in list(words.items()):
+        if "JJ" in tags:
+            if form.endswith("y"):
+                form = form[:-1] + "i"
+            if form.endswith("le"):
+                form = form[:-2]
+            adverb = words.setdefault(form + "ly", {})
+            adverb["RB"] = adverb[None] = tuple(tags["JJ"])
+
+    return {
+        form: (tags[None][0], tags[None][2], "RB" in tags)
+        for form, tags in words.items()
+    }
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Purpose:
+        Split a text into lower cased tokens like pattern's find_tokens
+    Args:
+        text: the text
+    Returns:
+        tokens: list of tokens
+    """
+    text = RE_CONTRACTIONS.sub(r" \1", text).translate(QUOTES)
+    text = RE_LINEBREAK.sub(f" {EOS} ", text.replace("\r\n", "\n"))
+    text = RE_WHITESPACE.sub(" ", text)
+
+    tokens = []
+    for token in text.split(" "):
+        if not token:
+            continue
+
+        tail = []
+        while token.startswith(SPLIT_PUNCTUATION) and token not in CONTRACTIONS:
+            tokens.append(token[0])
+            token = token[1:]
+
+        while token.endswith(TRAILING_PUNCTUATION) and token not in CONTRACTIONS:
+            if token.endswith(SPLIT_PUNCTUATION):
+                tail.append(token[-1])
+                token = token[:-1]
+            if token.endswith("..."):
+                tail.append("...")
+                token = token[:-3].rstrip(".")
+            if token.endswith("."):
+                if (
+                    token in ABBREVIATIONS
+                    or RE_ABBR1.match(token)
+                    or RE_ABBR2.match(token)
+                    or RE_ABBR3.match(token)
+                ):
+                    break
+                tail.append(".")
+                token = token[:-1]
+
+        if token:
+            tokens.append(token)
+        tokens.extend(reversed(tail))
+
+    text = " ".join(token for token in tokens if token != EOS)
+    text = RE_SARCASM.sub("(!)", text)
+    text = RE_EMOTICONS.sub(
+        lambda match: match.group(1).replace(" ", "") + match.group(2), text
+    )
+
+    return text.lower().split()
+
+
+class SentimentEngine:
+    def __init__(self, lexicon_path: str = None, cache_size: int = 65536):
+        """
+        Purpose:
+            Init SentimentEngine Class, loads the polarity lexicon once
+        Args:
+            lexicon_path: path of en-sentiment.xml, defaults to TextBlob's
+            cache_size: number of polarities cached by normalized text
+        Returns:
+            SentimentEngine class
+        """
+
+        self.lexicon = load_lexicon(lexicon_path or get_lexicon_path())
+        self.cache = ResultCache(cache_size)
+
+    def score_tokens(self, tokens: List[str]) -> float:
+        """
+        Purpose:
+            Average the polarity of the known words, with pattern's rules for
+            modifiers ("very good"), negations ("not good") and "!"
+        Args:
+            tokens: lower cased tokens
+        Returns:
+            polarity: between -1.0 and 1.0
+        """
+        lexicon = self.lexicon
+        assessed = []  # [polarity, intensity, negated]
+        modifier = None
+        negation = None
+
+        for word in tokens:
+            entry = lexicon.get(word)
+
+            if entry is not None:
+                polarity, intensity, is_adverb = entry
+
+                if modifier is None:
+                    assessed.append([polarity, intensity, False])
+                else:
+                    last = assessed[-1]
+                    last[0] = max(-1.0, min(polarity * last[1], 1.0))
+                    last[1] = intensity
+
+                if negation is not None:
+                    assessed[-1][1] = 1.0 / assessed[-1][1]
+                    assessed[-1][2] = True
+
+                modifier = word if is_adverb else None
+                negation = word if word in NEGATIONS else None
+                continue
+
+            if word in NEGATIONS:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+
+            if (
+                negation is not None
+                and modifier is not None
+                and modifier.endswith("ly")
+            ):
+                assessed[-1][2] = True
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+
+            if word == "!" and assessed:
+                assessed[-1][0] = max(-1.0, min(assessed[-1][0] * 1.25, 1.0))
+
+            if word == "(!)":
+                assessed.append([0.0, 1.0, False])
+
+            if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                emoticon = EMOTICON_POLARITY.get(word)
+                if emoticon is not None:
+                    assessed.append([emoticon, 1.0, False])
+
+        if not assessed:
+            return 0.0
+
+        total = 0
+        for polarity, _, negated in assessed:
+            total += polarity * -0.5 if negated else polarity
+
+        return total / float(len(assessed))
+
+    def polarity(self, text: str) -> float:
+        """
+        Purpose:
+            Get the polarity of one text, cached by normalized text
+        Args:
+            text: the text
+        Returns:
+            polarity: between -1.0 and 1.0
+        """
+        # Retweets repeat the text behind "RT @user: ", which adds no polarity
+        normalized = RE_WHITESPACE.sub(" ", RE_RETWEET.sub("", text)).strip()
+        key = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+        polarity = self.cache.get(key)
+        if polarity is MISSING:
+            polarity = self.score_tokens(tokenize(normalized))
+            self.cache.put(key, polarity)
+
+        return polarity
+
+    def polarity_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Purpose:
+            Get the polarity of many texts in one pass
+        Args:
+            texts: the texts
+        Returns:
+            polarities: array with one polarity per text
+        """
+        return np.fromiter(
+            (self.polarity(text) for text in texts), dtype=float, count=len(texts)
+        )
+
+
+# Shared engine, the lexicon is loaded on first use
+_engine = None
+
+
+def get_engine() -> SentimentEngine:
+    """
+    Purpose:
+        Get the shared SentimentEngine
+    Args:
+        N/A
+    Returns:
+        engine: the SentimentEngine
+    """
+    global _engine
+
+    if _engine is None:
+        _engine = SentimentEngine()
+
+    return _engine
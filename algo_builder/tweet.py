@@ -0,0 +1,205 @@
+"""
+Purpose:
+    This file contains the classes for the compact TweetBatch and TweetRow
+"""
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+import numpy as np
+
+# Format of created_at in the Twitter v1.1 JSON
+CREATED_AT_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+# Numeric columns, stored as fixed width arrays
+INT_COLUMNS = ["id", "favorite_count", "retweet_count", "followers_count"]
+
+# Text columns, stored as lists of str
+TEXT_COLUMNS = ["full_text", "screen_name", "lang"]
+
+# Keys a TweetRow answers to, like the python-twitter _json dict
+TWEET_KEYS = [
+    "id",
+    "id_str",
+    "full_text",
+    "created_at",
+    "favorite_count",
+    "retweet_count",
+    "lang",
+    "user",
+    "twitter_url",
+]
+
+
+def parse_created_at(created_at: str) -> float:
+    """
+    Purpose:
+        Turn a Twitter created_at string into a unix timestamp
+    Args:
+        created_at: created_at from the tweet JSON
+    Returns:
+        timestamp: seconds since the epoch, NaN if missing
+    """
+    if not created_at:
+        return float("nan")
+
+    return datetime.strptime(created_at, CREATED_AT_FORMAT).timestamp()
+
+
+def format_created_at(timestamp: float) -> str:
+    """
+    Purpose:
+        Turn a unix timestamp back into a Twitter created_at string
+    Args:
+        timestamp: seconds since the epoch
+    Returns:
+        created_at: string like the tweet JSON, None if missing
+    """
+    if np.isnan(timestamp):
+        return None
+
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(CREATED_AT_FORMAT)
+
+
+class TweetRow(Mapping):
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "TweetBatch", index: int):
+        """
+        Purpose:
+            Init TweetRow Class, a dict-like view of one tweet in a TweetBatch
+        Args:
+            batch: the TweetBatch holding the data
+            index: position of the tweet in the batch
+        Returns:
+            TweetRow class
+        """
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._batch.get_value(key, self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TWEET_KEYS)
+
+    def __len__(self) -> int:
+        return len(TWEET_KEYS)
+
+    def __repr__(self) -> str:
+        return f"TweetRow({self['id_str']})"
+
+
+class TweetBatch:
+    def __init__(self, columns: Dict[str, Union[np.ndarray, List[str]]]):
+        """
+        Purpose:
+            Init TweetBatch Class, a columnar batch of tweets. Only the fields
+            the algorithms read are kept, the full JSON is dropped
+        Args:
+            columns: arrays for INT_COLUMNS and created_at, lists for TEXT_COLUMNS
+        Returns:
+            TweetBatch class
+        """
+
+        self.columns = columns
+
+    @classmethod
+    def from_json(cls, tweets: Iterable[Dict[str, Any]]) -> "TweetBatch":
+        """
+        Purpose:
+            Build a batch from python-twitter JSON dicts, one at a time so the
+            dicts can be freed as they are read
+        Args:
+            tweets: iterable of tweet JSON
+        Returns:
+            TweetBatch of the tweets
+        """
+
+        values = {name: [] for name in INT_COLUMNS + TEXT_COLUMNS + ["created_at"]}
+
+        for tweet in tweets:
+            user = tweet.get("user") or {}
+
+            values["id"].append(int(tweet["id_str"]))
+            values["favorite_count"].append(tweet.get("favorite_count") or 0)
+            values["retweet_count"].append(tweet.get("retweet_count") or 0)
+            values["followers_count"].append(user.get("followers_count") or 0)
+            values["created_at"].append(parse_created_at(tweet.get("created_at")))
+            values["full_text"].append(tweet.get("full_text", ""))
+            values["screen_name"].append(user.get("screen_name", ""))
+            values["lang"].append(tweet.get("lang"))
+
+        columns = {}
+        for name in INT_COLUMNS:
+            columns[name] = np.array(values[name], dtype=np.int64)
+        columns["created_at"] = np.array(values["created_at"], dtype=np.float64)
+        for name in TEXT_COLUMNS:
+            columns[name] = values[name]
+
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TweetRow, "TweetBatch"]:
+        if isinstance(index, slice):
+            return TweetBatch(
+                {name: column[index] for name, column in self.columns.items()}
+            )
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TweetBatch index out of range")
+
+        return TweetRow(self, index)
+
+    def __iter__(self) -> Iterator[TweetRow]:
+        for index in range(len(self)):
+            yield TweetRow(self, index)
+
+    def column(self, name: str) -> Union[np.ndarray, List[str]]:
+        """
+        Purpose:
+            Get a whole column, for batch functions
+        Args:
+            name: column name, see INT_COLUMNS and TEXT_COLUMNS
+        Returns:
+            column: array or list with one value per tweet
+        """
+        return self.columns[name]
+
+    def get_value(self, key: str, index: int) -> Any:
+        """
+        Purpose:
+            Get a tweet JSON value, rebuilt from the columns
+        Args:
+            key: key of the tweet JSON, see TWEET_KEYS
+            index: position of the tweet
+        Returns:
+            value: the value the JSON dict would have
+        """
+        columns = self.columns
+
+        if key == "id_str":
+            return str(columns["id"][index])
+        if key == "twitter_url":
+            return (
+                f"https://twitter.com/{columns['screen_name'][index]}"
+                f"/status/{columns['id'][index]}"
+            )
+        if key == "user":
+            return {
+                "screen_name": columns["screen_name"][index],
+                "followers_count": int(columns["followers_count"][index]),
+            }
+        if key == "created_at":
+            return format_created_at(columns["created_at"][index])
+        if key in TEXT_COLUMNS:
+            return columns[key][index]
+        if key in INT_COLUMNS:
+            return int(columns[key][index])
+
+        raise KeyError(key)
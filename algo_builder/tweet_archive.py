@@ -0,0 +1,416 @@
+"""
+Purpose:
+    This file contains the classes for TweetArchive, an append only columnar
+    file format for tweets that is read through mmap, and TextColumn
+
+    An archive is a folder with one file per column. Numeric columns are
+    little endian 8 byte values, text columns are an offsets file plus one
+    UTF-8 blob, and a sorted id index is kept in files named after the
+    number of tweets they cover. meta.json holds the number of committed
+    tweets and the index files that go with them. Tweets
+    are read as TweetBatch and TweetRow views over the mapped files, so only
+    the values a Function reads are decoded. Missing text values, like a
+    tweet without a lang, read back as empty strings.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+import glob
+import itertools
+import mmap
+import os
+
+import numpy as np
+
+from . import utils
+from .tweet import INT_COLUMNS, TEXT_COLUMNS, TweetBatch, TweetRow
+
+ARCHIVE_VERSION = 1
+
+# Fixed width columns and their on disk dtype
+FIXED_COLUMNS = {name: np.dtype("<i8") for name in INT_COLUMNS}
+FIXED_COLUMNS["created_at"] = np.dtype("<f8")
+
+OFFSET_DTYPE = np.dtype("<i8")
+
+# Tweets converted and written at a time by append
+APPEND_CHUNK_SIZE = 10000
+
+# Index files of archives written before the index had generations
+DEFAULT_INDEX_FILES = {"id_sorted": "id_sorted.bin", "id_positions": "id_positions.bin"}
+
+
+def map_file(path: str) -> Union[mmap.mmap, bytes]:
+    """
+    Purpose:
+        Map a file read only
+    Args:
+        path: path of the file
+    Returns:
+        buffer: the mapped file, empty bytes for an empty file
+    """
+    with open(path, "rb") as column_file:
+        if os.fstat(column_file.fileno()).st_size == 0:
+            return b""  # mmap can not map an empty file
+
+        return mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class TextColumn:
+    def __init__(self, offsets: np.ndarray, blob: Union[mmap.mmap, bytes]):
+        """
+        Purpose:
+            Init TextColumn Class, a list-like view of strings in a UTF-8
+            blob. A string is only decoded when it is read
+        Args:
+            offsets: n + 1 byte offsets into the blob
+            blob: the UTF-8 bytes of all the strings
+        Returns:
+            TextColumn class
+        """
+
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "TextColumn"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TextColumn slices must be contiguous")
+
+            return TextColumn(self.offsets[start : max(stop, start) + 1], self.blob)
+
+        if index < 0:
+            index += len(self)
+
+        return str(self.get_bytes(index), "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def get_bytes(self, index: int) -> memoryview:
+        """
+        Purpose:
+            Get the UTF-8 bytes of one string without copying them
+        Args:
+            index: position of the string
+        Returns:
+            view: memoryview into the mapped blob
+        """
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return memoryview(self.blob)[start:stop]
+
+
+class TweetArchive:
+    def __init__(self, path: str):
+        """
+        Purpose:
+            Init TweetArchive Class, opens or creates the archive folder
+        Args:
+            path: folder of the archive
+        Returns:
+            TweetArchive class
+        """
+
+        self.path = path
+        self.meta_path = os.path.join(path, "meta.json")
+
+        if not os.path.exists(self.meta_path):
+            self._create()
+
+        meta = utils.load_json(self.meta_path)
+        if meta.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version {meta.get('version')}")
+
+        self._map()
+
+    def _get_column_path(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _get_meta(self, num_tweets: int) -> Dict[str, Any]:
+        """
+        Purpose:
+            Build the meta.json of an archive with num_tweets tweets
+        Args:
+            num_tweets: number of committed tweets
+        Returns:
+            meta: version, tweet count and the index files for that count
+        """
+        return {
+            "version": ARCHIVE_VERSION,
+            "num_tweets": num_tweets,
+            "index": {name: f"{name}-{num_tweets}.bin" for name in DEFAULT_INDEX_FILES},
+        }
+
+    def _create(self) -> None:
+        """
+        Purpose:
+            Write an empty archive
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        os.makedirs(self.path, exist_ok=True)
+
+        for name in FIXED_COLUMNS:
+            open(self._get_column_path(f"{name}.bin"), "wb").close()
+
+        for name in TEXT_COLUMNS:
+            with open(self._get_column_path(f"{name}.offsets"), "wb") as offsets:
+                offsets.write(np.zeros(1, dtype=OFFSET_DTYPE).tobytes())
+            open(self._get_column_path(f"{name}.utf8"), "wb").close()
+
+        meta = self._get_meta(0)
+        for file_name in meta["index"].values():
+            open(self._get_column_path(file_name), "wb").close()
+
+        utils.save_json_atomic(self.meta_path, meta)
+
+    def _map(self) -> None:
+        """
+        Purpose:
+            Map the committed part of every column file
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        meta = utils.load_json(self.meta_path)
+        self.num_tweets = meta["num_tweets"]
+        self.index_files = meta.get("index", DEFAULT_INDEX_FILES)
+        count = self.num_tweets
+
+        columns = {}
+
+        for name, dtype in FIXED_COLUMNS.items():
+            buffer = map_file(self._get_column_path(f"{name}.bin"))
+            columns[name] = np.frombuffer(buffer, dtype=dtype, count=count)
+
+        for name in TEXT_COLUMNS:
+            offsets = np.frombuffer(
+                map_file(self._get_column_path(f"{name}.offsets")),
+                dtype=OFFSET_DTYPE,
+                count=count + 1,
+            )
+            blob = map_file(self._get_column_path(f"{name}.utf8"))
+            columns[name] = TextColumn(offsets, blob)
+
+        self.columns = columns
+
+        # Ids in sorted order, and the position of each in the archive
+        self.id_sorted, self.id_positions = [
+            np.frombuffer(
+                map_file(self._get_column_path(self.index_files[name])),
+                dtype=np.dtype("<i8"),
+                count=count,
+            )
+            for name in ["id_sorted", "id_positions"]
+        ]
+
+    def __len__(self) -> int:
+        return self.num_tweets
+
+    def batch(self, start: int = 0, stop: int = None) -> TweetBatch:
+        """
+        Purpose:
+            Get a range of tweets as a TweetBatch, without copying
+        Args:
+            start: position of the first tweet
+            stop: position after the last tweet, None for the end
+        Returns:
+            TweetBatch view over the archive
+        """
+        return TweetBatch(self.columns)[start:stop]
+
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[TweetBatch]:
+        """
+        Purpose:
+            Walk the archive a batch at a time
+        Args:
+            batch_size: number of tweets per batch
+        Returns:
+            generator of TweetBatch views
+        """
+        for start in range(0, len(self), batch_size):
+            yield self.batch(start, start + batch_size)
+
+    def __iter__(self) -> Iterator[TweetRow]:
+        return iter(self.batch())
+
+    def get(self, id_str: str) -> TweetRow:
+        """
+        Purpose:
+            Get a tweet by id with a binary search of the id index
+        Args:
+            id_str: id of the tweet
+        Returns:
+            TweetRow of the tweet, the last one appended if the id repeats
+        """
+        tweet_id = int(id_str)
+
+        found = np.searchsorted(self.id_sorted, tweet_id, side="right") - 1
+        if found < 0 or self.id_sorted[found] != tweet_id:
+            raise KeyError(id_str)
+
+        return TweetBatch(self.columns)[int(self.id_positions[found])]
+
+    def __contains__(self, id_str: str) -> bool:
+        try:
+            self.get(id_str)
+        except KeyError:
+            return False
+
+        return True
+
+    def _truncate(self) -> None:
+        """
+        Purpose:
+            Cut off data a crashed append wrote after the committed tweets
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        count = self.num_tweets
+
+        for name, dtype in FIXED_COLUMNS.items():
+            os.truncate(self._get_column_path(f"{name}.bin"), count * dtype.itemsize)
+
+        for name in TEXT_COLUMNS:
+            offsets = self.columns[name].offsets
+            os.truncate(
+                self._get_column_path(f"{name}.offsets"),
+                (count + 1) * OFFSET_DTYPE.itemsize,
+            )
+            os.truncate(self._get_column_path(f"{name}.utf8"), int(offsets[count]))
+
+    def append(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Purpose:
+            Add tweets to the end of the archive. The new tweets only become
+            visible once all their columns are written
+        Args:
+            tweets: iterable of tweet JSON
+        Returns:
+            count: number of tweets added
+        """
+        self._truncate()
+
+        added = 0
+        new_ids = []
+        tweet_iter = iter(tweets)
+
+        while True:
+            chunk = TweetBatch.from_json(
+                itertools.islice(tweet_iter, APPEND_CHUNK_SIZE)
+            )
+            if not len(chunk):
+                break
+
+            self._write_chunk(chunk)
+            new_ids.append(np.asarray(chunk.column("id"), dtype="<i8"))
+            added += len(chunk)
+
+        if not added:
+            return 0
+
+        # The new index goes in new files, readers keep using the old one
+        meta = self._get_meta(self.num_tweets + added)
+        self._write_index(np.concatenate(new_ids), meta["index"])
+
+        # Commit, readers only look at num_tweets tweets and their index
+        utils.save_json_atomic(self.meta_path, meta)
+        self._map()
+        self._remove_old_indexes()
+
+        return added
+
+    def _merge_index(self, new_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Purpose:
+            Merge the ids of appended tweets into the committed index, so an
+            append only sorts its own ids
+        Args:
+            new_ids: ids of the appended tweets, in archive order
+        Returns:
+            (id_sorted, id_positions) over the committed and appended tweets
+        """
+        order = np.argsort(new_ids, kind="stable")
+        new_sorted = new_ids[order]
+        new_positions = (self.num_tweets + order).astype("<i8")
+
+        # Repeated ids go after the committed ones, get returns the last
+        slots = np.searchsorted(self.id_sorted, new_sorted, side="right")
+
+        id_sorted = np.insert(self.id_sorted, slots, new_sorted)
+        id_positions = np.insert(self.id_positions, slots, new_positions)
+
+        return id_sorted, id_positions
+
+    def _write_index(self, new_ids: np.ndarray, index_files: Dict[str, str]) -> None:
+        """
+        Purpose:
+            Write the index of the next commit to its own files
+        Args:
+            new_ids: ids of the appended tweets, in archive order
+            index_files: file name of each index array, from _get_meta
+        Returns:
+            N/A
+        """
+        id_sorted, id_positions = self._merge_index(new_ids)
+
+        for name, values in [("id_sorted", id_sorted), ("id_positions", id_positions)]:
+            index_path = self._get_column_path(index_files[name])
+            values.astype("<i8").tofile(f"{index_path}.tmp")
+            os.replace(f"{index_path}.tmp", index_path)
+
+    def _remove_old_indexes(self) -> None:
+        """
+        Purpose:
+            Delete index files of earlier commits and of crashed appends
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        current = set(self.index_files.values())
+
+        for name in DEFAULT_INDEX_FILES:
+            for index_path in glob.glob(self._get_column_path(f"{name}*")):
+                if os.path.basename(index_path) in current:
+                    continue
+
+                try:
+                    os.remove(index_path)
+                except OSError:
+                    pass  # Still mapped by a reader on some platforms
+
+    def _write_chunk(self, chunk: TweetBatch) -> None:
+        """
+        Purpose:
+            Append the columns of a batch to the column files
+        Args:
+            chunk: TweetBatch built from JSON
+        Returns:
+            N/A
+        """
+        for name, dtype in FIXED_COLUMNS.items():
+            with open(self._get_column_path(f"{name}.bin"), "ab") as column_file:
+                column_file.write(np.asarray(chunk.column(name), dtype=dtype).tobytes())
+
+        for name in TEXT_COLUMNS:
+            blob_path = self._get_column_path(f"{name}.utf8")
+            encoded = [(text or "").encode("utf-8") for text in chunk.column(name)]
+
+            lengths = np.fromiter(map(len, encoded), dtype=OFFSET_DTYPE)
+            offsets = os.path.getsize(blob_path) + np.cumsum(lengths)
+
+            with open(blob_path, "ab") as blob_file:
+                blob_file.write(b"".join(encoded))
+
+            with open(self._get_column_path(f"{name}.offsets"), "ab") as offsets_file:
+                offsets_file.write(offsets.astype(OFFSET_DTYPE).tobytes())
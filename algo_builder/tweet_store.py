@@ -0,0 +1,210 @@
+"""
+Purpose:
+    This file contains the class for TweetStore
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import json
+import sqlite3
+
+# Most tweets one sync fetches, older new tweets are left to later syncs
+MAX_SYNC_TWEETS = 3200
+
+
+class TweetStore:
+    def __init__(self, path: str = "tweet_store.db"):
+        """
+        Purpose:
+            Init TweetStore Class, an on disk SQLite store of tweets keyed by id
+        Args:
+            path: path of the SQLite file
+        Returns:
+            TweetStore class
+        """
+
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tweets ("
+            "id INTEGER PRIMARY KEY, id_str TEXT NOT NULL, json TEXT NOT NULL)"
+        )
+        # Id ranges a sync stopped before reaching, since_id < id <= max_id
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS gaps ("
+            "max_id INTEGER NOT NULL, since_id INTEGER NOT NULL, "
+            "PRIMARY KEY (max_id, since_id))"
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """
+        Purpose:
+            Close the store
+        Args:
+            N/A
+        Returns:
+            N/A
+        """
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+
+    def add_tweets(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Purpose:
+            Save tweets, replacing any with the same id
+        Args:
+            tweets: tweet JSON dicts
+        Returns:
+            count: number of tweets saved
+        """
+        with self.conn:
+            return self._insert_tweets(tweets)
+
+    def _insert_tweets(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Purpose:
+            Save tweets without committing, see add_tweets
+        Args:
+            tweets: tweet JSON dicts
+        Returns:
+            count: number of tweets saved
+        """
+        rows = [
+            (int(tweet["id_str"]), tweet["id_str"], json.dumps(tweet))
+            for tweet in tweets
+        ]
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO tweets (id, id_str, json) VALUES (?, ?, ?)",
+            rows,
+        )
+
+        return len(rows)
+
+    def get_since_id(self) -> int:
+        """
+        Purpose:
+            Get the id of the newest stored tweet
+        Args:
+            N/A
+        Returns:
+            since_id: newest id, None if the store is empty
+        """
+        return self.conn.execute("SELECT MAX(id) FROM tweets").fetchone()[0]
+
+    def get_gaps(self) -> List[Tuple[int, int]]:
+        """
+        Purpose:
+            Get the id ranges that may still be missing tweets
+        Args:
+            N/A
+        Returns:
+            gaps: (max_id, since_id) per range, newest first
+        """
+        return self.conn.execute(
+            "SELECT max_id, since_id FROM gaps ORDER BY max_id DESC"
+        ).fetchall()
+
+    def get_tweet(self, id_str: str) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get one tweet by id
+        Args:
+            id_str: id of the tweet
+        Returns:
+            tweet: the tweet JSON, None if not stored
+        """
+        row = self.conn.execute(
+            "SELECT json FROM tweets WHERE id = ?", (int(id_str),)
+        ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def latest(self, num_tweets: int) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Get the newest stored tweets
+        Args:
+            num_tweets: number of tweets
+        Returns:
+            tweets: tweet JSON dicts, newest first
+        """
+        rows = self.conn.execute(
+            "SELECT json FROM tweets ORDER BY id DESC LIMIT ?", (num_tweets,)
+        )
+
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_tweets(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Purpose:
+            Read every stored tweet, for rescoring offline
+        Args:
+            batch_size: number of rows read from disk at a time
+        Returns:
+            generator of tweet JSON dicts, newest first
+        """
+        cursor = self.conn.execute("SELECT json FROM tweets ORDER BY id DESC")
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+
+            for row in rows:
+                yield json.loads(row[0])
+
+    def sync(
+        self, fetcher: Any, num_tweets: int, max_fetch: int = MAX_SYNC_TWEETS
+    ) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Only fetch tweets newer than the stored ones, serve the rest from
+            disk. All tweets since the last sync are fetched, up to
+            max_fetch. If the limit cuts a range short, the rest of it is
+            kept as a gap and fetched by later syncs
+        Args:
+            fetcher: TimelineFetcher to get new tweets with
+            num_tweets: number of tweets to return
+            max_fetch: most tweets to fetch in this sync
+        Returns:
+            tweets: the newest tweets, newest first
+        """
+        since_id = self.get_since_id()
+
+        if since_id is None:
+            # Empty store, there is no older tweet to line up with
+            self.add_tweets(fetcher.fetch(num_tweets))
+            return self.latest(num_tweets)
+
+        budget = max(max_fetch, num_tweets)
+
+        # New tweets first, then the gaps left by earlier syncs
+        for max_id, range_since_id in [(None, since_id)] + self.get_gaps():
+            if budget <= 0:
+                break
+
+            tweets = fetcher.fetch(budget, since_id=range_since_id, max_id=max_id)
+            budget -= len(tweets)
+
+            # Tweets and gaps change together, so a crash can not lose a gap
+            with self.conn:
+                self._insert_tweets(tweets)
+
+                if max_id is not None:
+                    self.conn.execute(
+                        "DELETE FROM gaps WHERE max_id = ? AND since_id = ?",
+                        (max_id, range_since_id),
+                    )
+
+                # Stopped at the limit, older tweets of the range may be left
+                oldest = min((int(tweet["id_str"]) for tweet in tweets), default=0)
+                if budget <= 0 and oldest - 1 > range_since_id:
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO gaps (max_id, since_id) VALUES (?, ?)",
+                        (oldest - 1, range_since_id),
+                    )
+
+        return self.latest(num_tweets)
@@ -1,9 +1,18 @@
 import json
 import logging
 import os
-from typing import Type, Union, Dict, Any, List
+import uuid
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Type, Union, Dict, Any, Iterator, List
 
-import pandas as pd
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def write_to_file(file_path: str, file_text: str) -> bool:
@@ -68,7 +77,7 @@ def read_from_file(file_path: str) -> str:
     return read_data
 
 
-def make_df_from_dict(dict_obj: Dict[str, List[Any]]) -> pd.DataFrame:
+def make_df_from_dict(dict_obj: Dict[str, List[Any]]) -> "pd.DataFrame":
     """
     Purpose:
         turns a dictonary to a pandas dataframe
@@ -78,6 +87,8 @@ def make_df_from_dict(dict_obj: Dict[str, List[Any]]) -> pd.DataFrame:
         df: Dataframe of the dictonary
     """
 
+    import pandas as pd
+
     df_map = {}
     keys = dict_obj.keys()
 
@@ -139,3 +150,63 @@ def save_json(json_path: str, json_data: Any) -> None:
             json.dump(json_data, outfile)
     except Exception as error:
         raise OSError(error)
+
+
+def save_json_atomic(json_path: str, json_data: Any) -> None:
+    """
+    Purpose:
+        Save json files atomically, readers see the old or the new file, never half of one
+    Args:
+        json_path (String): Path to  json file
+        json_data: Data to save
+    Returns:
+        N/A
+    """
+    folder = os.path.dirname(os.path.abspath(json_path))
+    temp_path = os.path.join(
+        folder, f".{os.path.basename(json_path)}.{uuid.uuid4().hex}.tmp"
+    )
+
+    try:
+        # Created like open() would, so the umask applies
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(descriptor, "w") as outfile:
+            json.dump(json_data, outfile)
+
+        # Keep the mode of the file being replaced
+        if os.path.exists(json_path):
+            os.chmod(temp_path, os.stat(json_path).st_mode & 0o777)
+
+        os.replace(temp_path, json_path)
+    except Exception as error:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise OSError(error)
+
+
+@contextmanager
+def file_lock(lock_path: str) -> Iterator[None]:
+    """
+    Purpose:
+        Hold an exclusive lock on a lock file, across processes
+    Args:
+        lock_path (String): Path of the lock file, created if missing
+    Returns:
+        context manager, the lock is held inside the with block
+    """
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -3,8 +3,11 @@ Purpose:
     This file contains the class for WeightedFunction
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 import numbers
+
+import numpy as np
+
 from .function import Function
 
 
@@ -20,14 +23,14 @@ class WeightedFunction:
             WeightedFunction class
         """
 
+        self.weight = weight
+        self.func = func
+
         if name:
             self.name = name
         else:
             self.name = self.func.name
 
-        self.weight = weight
-        self.func = func
-
     def get_name(self):
         """
         Purpose:
@@ -57,3 +60,14 @@ class WeightedFunction:
             raise ValueError("Function must return a number")
 
         return result * self.weight
+
+    def run_batch(self, tweets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Purpose:
+            Run the code for the algorithm on a list of tweets
+        Args:
+            tweets: The list of tweets to run the algorithm on
+        Returns:
+            results: array of weighted scores, one per tweet
+        """
+        return self.func.run_batch(tweets) * self.weight
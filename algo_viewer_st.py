@@ -4,20 +4,20 @@ Purpose:
 """
 
 # Python imports
-from typing import Type, Union, Dict, Any, List, Tuple
-import requests
-import glob
+from typing import TYPE_CHECKING, Type, Union, Dict, Any, List, Tuple
 
 # 3rd party imports
 import streamlit as st
 import streamlit.components.v1 as components
-from yellowbrick.target import FeatureCorrelation
 import pandas as pd
 
 # project imports
-import test_algo_builder
-import algo_builder.utils as utils
-import algo_builder.algorithm
+from algo_builder.catalog import AlgoCatalog
+from algo_builder.correlation import CorrelationEngine, plot_correlation
+from algo_builder.evaluator import Evaluator
+
+if TYPE_CHECKING:
+    from algo_builder.oembed import OEmbedClient
 
 
 def feature_correlation(df: pd.DataFrame) -> None:
@@ -31,19 +31,12 @@ def feature_correlation(df: pd.DataFrame) -> None:
     """
     target_string = "algo_score"
 
-    feature_cols = [
-        col
-        for col in df.columns
-        if col != target_string and col != "twitter_url" and df[col].dtype != "object"
-    ]
-
-    # method = st.selectbox(
-    #     "Select the correlation method", ["mutual_info-regression", "pearson"]
-    # )
-    method = "mutual_info-regression"
+    method = st.selectbox(
+        "Select the correlation method", ["pearson", "mutual_info-regression"]
+    )
     try:
-        viz = FeatureCorrelation(method=method, feature_names=feature_cols, sort=True)
-        viz.fit(df[feature_cols], df[target_string])
+        scores = get_correlation_engine().compute(df, target_string, method=method)
+        viz = plot_correlation(scores, method=method)
         fig = viz.fig
         ax = viz.show()
         fig.axes.append(ax)
@@ -60,9 +53,7 @@ class Tweet(object):
         if not embed_str:
             # Use Twitter's oEmbed API
             # https://dev.twitter.com/web/embedded-tweets
-            api = "https://publish.twitter.com/oembed?url={}".format(s)
-            response = requests.get(api)
-            self.text = response.json()["html"]
+            self.text = get_oembed_client().fetch(s)
         else:
             self.text = s
 
@@ -73,6 +64,62 @@ class Tweet(object):
         return components.html(self.text, height=600)
 
 
+def get_timeline(num_tweets: int) -> List[Dict[str, Any]]:
+    """
+    Purpose:
+        Get tweets from your timeline. The Twitter client and credentials
+        are only loaded once tweets are asked for
+    Args:
+        num_tweets: number of tweets
+    Returns:
+        tweets from timeline
+    """
+    import test_algo_builder
+
+    return test_algo_builder.sync_home_timeline(num_tweets)
+
+
+@st.cache_resource
+def get_oembed_client() -> "OEmbedClient":
+    """
+    Purpose:
+        Get the oEmbed client, shared across reruns
+    Args:
+        N/A
+    Returns:
+        client: OEmbedClient with a pooled session and disk cache
+    """
+    from algo_builder.oembed import OEmbedClient
+
+    return OEmbedClient(cache_dir=".oembed_cache")
+
+
+@st.cache_resource
+def get_correlation_engine() -> CorrelationEngine:
+    """
+    Purpose:
+        Get the correlation engine, its cache is shared across reruns
+    Args:
+        N/A
+    Returns:
+        engine: CorrelationEngine
+    """
+    return CorrelationEngine(method="pearson", sample_size=5000)
+
+
+@st.cache_resource
+def get_catalog() -> AlgoCatalog:
+    """
+    Purpose:
+        Get the algo catalog, shared across reruns
+    Args:
+        N/A
+    Returns:
+        catalog: AlgoCatalog of saved_algos
+    """
+    return AlgoCatalog("saved_algos")
+
+
 def sidebar() -> None:
     """
     Purpose:
@@ -85,13 +132,19 @@ def sidebar() -> None:
 
     st.sidebar.title("Twitter Algo Viewer")
 
-    pages = ["Home"]
+    pages = ["Home", "Compare", "Tune Weights"]
     default_page = 0
     page = st.sidebar.selectbox("Go To", options=pages, index=default_page)
 
     if page == "Home":
         home_page()
 
+    elif page == "Compare":
+        compare_page()
+
+    elif page == "Tune Weights":
+        tune_weights_page()
+
     else:
         st.error("Invalid Page")
 
@@ -109,27 +162,9 @@ def home_page():
     st.title("Twitter Algo Viewer")
     st.subheader("Bring your own algo")
 
-    algo_jsons = glob.glob("saved_algos/*.json")
-    # Algo metadata
-    algo_data_map = {}
-
-    print(algo_jsons)
-    for algo_json in algo_jsons:
-
-        algo_data = utils.load_json(algo_json)
-
-        algo_name = algo_data["name"]
-        algo_desc = algo_data["desc"]
-        algo_path = algo_data["algo_path"]
-
-        # make new entry in map
-        algo_data_map[algo_name] = {}
-        algo_data_map[algo_name]["desc"] = algo_desc
-        algo_data_map[algo_name]["algo"] = algo_path
-
-    # Get list of algos
-
-    print(algo_data_map)
+    # Algo metadata, from the catalog manifest
+    catalog = get_catalog()
+    algo_data_map = catalog.list_algos()
 
     # Select Algo
     algos = list(algo_data_map.keys())
@@ -142,11 +177,17 @@ def home_page():
     if st.button("Get Tweets"):
 
         # Get Raw tweets
-        raw_tweets = test_algo_builder.get_home_timeline(num_tweets)
-        curr_algo_path = algo_data_map[selected_algo]["algo"]
+        raw_tweets = get_timeline(num_tweets)
 
+        # Code is imported on first use, so a stale algo fails while scoring
         try:
-            curr_algo = algo_builder.algorithm.load_algo(curr_algo_path)
+            curr_algo = catalog.load(selected_algo)
+
+            # Run algo on tweets, timing each function. The loaded algo is
+            # cached across sessions, so time a copy of it
+            session_algo = curr_algo.with_instrumentation()
+            df = session_algo.process_tweets(raw_tweets)
+            instrumentation = session_algo.instrumentation
         except Exception as error:
             st.error(error)
             st.stop()
@@ -154,9 +195,6 @@ def home_page():
         st.header(curr_algo.name)
         st.subheader(curr_algo.desc)
 
-        # Run algo on tweets
-        df = curr_algo.process_tweets(raw_tweets)
-
         # st.write(sorted_df)
         st.subheader("Given Input Weights")
 
@@ -168,6 +206,9 @@ def home_page():
             cur_col = index % 3  # Multipe of 3 for each weight
             col_list[cur_col].metric(func.get_name(), round(func.weight, 2))
 
+        st.subheader("Function Timings")
+        st.dataframe(instrumentation.summary(), hide_index=True)
+
         st.header("Feature Correlation")
 
         st.write(
@@ -175,6 +216,9 @@ def home_page():
         )
         feature_correlation(df)
 
+        # Get all the embeds at once
+        embeds = get_oembed_client().fetch_many(df["twitter_url"].tolist())
+
         # Display tweets with the score
         for index, tweet in df.iterrows():
 
@@ -192,7 +236,123 @@ def home_page():
                     cur_col = index % 3  # Multipe of 3 for each weight
                     col_list[cur_col].metric(name, round(tweet[name], 2))
 
-            tweet_display = Tweet(tweet["twitter_url"]).component()
+            embed_html = embeds[tweet["twitter_url"]]
+            if embed_html is None:
+                st.write(tweet["twitter_url"])
+            else:
+                tweet_display = Tweet(embed_html, embed_str=True).component()
+
+
+def compare_page():
+    """
+    Purpose:
+        Show the rankings of several algos side by side
+    Args:
+        N/A
+    Returns:
+        N/A
+    """
+
+    st.title("Compare Algos")
+    st.subheader("Every algo ranks the same timeline")
+
+    catalog = get_catalog()
+    algos = list(catalog.list_algos().keys())
+    selected_algos = st.multiselect("Algorithms", algos, default=algos[:2])
+
+    num_tweets = st.number_input(label="Number of tweets", value=20, max_value=200)
+    top_k = st.number_input(label="Ranks to show", value=10, min_value=1)
+
+    if st.button("Compare") and selected_algos:
+
+        # Get Raw tweets
+        raw_tweets = get_timeline(num_tweets)
+
+        try:
+            curr_algos = [catalog.load(name) for name in selected_algos]
+            evaluator = Evaluator(curr_algos)
+
+            # Shared functions only run once for all the algos
+            evaluation = evaluator.evaluate(raw_tweets)
+        except Exception as error:
+            st.error(error)
+            st.stop()
+
+        st.write(
+            f"Ran {evaluator.num_runs()} functions for {len(curr_algos)} algorithms"
+        )
+
+        st.header("Rankings")
+        st.dataframe(evaluation.side_by_side(int(top_k)))
+
+        st.header("Rank of each tweet")
+        st.dataframe(evaluation.ranks(), hide_index=True)
+
+        st.header("Scores")
+        st.dataframe(evaluation.scores(), hide_index=True)
+
+
+def tune_weights_page():
+    """
+    Purpose:
+        Re-rank the timeline with new weights, without running the functions
+        again
+    Args:
+        N/A
+    Returns:
+        N/A
+    """
+
+    st.title("Tune Weights")
+    st.subheader("Move a weight to re-rank the timeline")
+
+    catalog = get_catalog()
+    algos = list(catalog.list_algos().keys())
+    selected_algo = st.selectbox("Algorithms", algos)
+
+    num_tweets = st.number_input(label="Number of tweets", value=200, max_value=200)
+
+    if st.button("Get Tweets"):
+
+        # Get Raw tweets
+        raw_tweets = get_timeline(num_tweets)
+
+        try:
+            curr_algo = catalog.load(selected_algo)
+
+            # The functions only run here, the sliders reuse the matrix
+            score_matrix = curr_algo.score_matrix(raw_tweets)
+        except Exception as error:
+            st.error(error)
+            st.stop()
+
+        st.session_state["score_matrix"] = (selected_algo, score_matrix)
+
+    # Only the algo the matrix was scored with, until Get Tweets is pressed
+    algo_name, score_matrix = st.session_state.get("score_matrix", (None, None))
+    if algo_name != selected_algo:
+        return
+
+    st.subheader("Weights")
+
+    col1, col2, col3 = st.columns(3)
+    col_list = [col1, col2, col3]
+    weights = []
+
+    for index, (name, weight) in enumerate(
+        zip(score_matrix.names, score_matrix.weights)
+    ):
+        cur_col = index % 3  # Multipe of 3 for each weight
+        weights.append(
+            col_list[cur_col].slider(
+                name, min_value=-10.0, max_value=10.0, value=float(weight), step=0.1
+            )
+        )
+
+    df = score_matrix.rerank(weights)
+
+    st.header(f"Ranked {len(score_matrix)} tweets")
+    st.dataframe(df, hide_index=True)
 
 
 def app() -> None:
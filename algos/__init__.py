@@ -1,2 +1,81 @@
-from .random_3_algo import Random_3_algo
-from .simple_algo import SimpleAlgo
\ No newline at end of file
+"""
+Purpose:
+    Registry of the algorithms. An algorithm module is only imported the
+    first time its class is used, e.g. algos.SimpleAlgo. Other packages can
+    add algorithms with an entry point in the "twitter_algo_builder.algos"
+    group, pointing at a TwitterAlgorithm class
+"""
+
+from importlib import import_module
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Dict, List
+
+ENTRY_POINT_GROUP = "twitter_algo_builder.algos"
+
+# Algorithm class name -> module in this package
+ALGOS = {
+    "FastSentimentAlgo": ".fast_sentiment_algo",
+    "Random_3_algo": ".random_3_algo",
+    "SimpleAlgo": ".simple_algo",
+}
+
+
+def get_entry_points() -> Dict[str, EntryPoint]:
+    """
+    Purpose:
+        Find the algorithms installed by other packages
+    Args:
+        N/A
+    Returns:
+        entry points by algorithm name
+    """
+    return {
+        entry_point.name: entry_point
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    }
+
+
+def list_algos() -> List[str]:
+    """
+    Purpose:
+        List the algorithms without importing them
+    Args:
+        N/A
+    Returns:
+        names of the algorithm classes
+    """
+    return sorted(set(ALGOS) | set(get_entry_points()))
+
+
+def get_algo(name: str) -> Any:
+    """
+    Purpose:
+        Import an algorithm class by name
+    Args:
+        name: name of the algorithm class, see list_algos
+    Returns:
+        the TwitterAlgorithm class
+    """
+    if name in ALGOS:
+        return getattr(import_module(ALGOS[name], __name__), name)
+
+    entry_point = get_entry_points().get(name)
+    if entry_point is None:
+        raise ValueError(f"Unknown algo {name}")
+
+    return entry_point.load()
+
+
+def __getattr__(name: str) -> Any:
+    # Import the algorithm module on first use, see PEP 562
+    if name not in ALGOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    algo_class = get_algo(name)
+    globals()[name] = algo_class
+
+    return algo_class
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(ALGOS))
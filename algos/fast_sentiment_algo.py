@@ -0,0 +1,76 @@
+import numpy as np
+
+from .algo_interface import TwitterAlgorithm
+from .simple_algo import tweet_length, tweet_length_batch
+from algo_builder.function import Function
+from algo_builder.weighted_function import WeightedFunction
+from algo_builder.algorithm import Algorithm
+from algo_builder.sentiment import get_engine
+
+
+def fast_sent(tweet):
+    """
+    Purpose:
+        Postive tweets have higher score, same score as textblob_sent
+    Args:
+        tweet: tweet data
+    Returns:
+        score based on sentiment
+    """
+    score = min(get_engine().polarity(tweet["full_text"]), 1.0)
+
+    return min(score * 100, 100.0)
+
+
+def fast_sent_batch(tweets):
+    """
+    Purpose:
+        Batch version of fast_sent, scores all tweets with the shared engine
+    Args:
+        tweets: list of tweet data
+    Returns:
+        array of scores based on sentiment
+    """
+    polarities = get_engine().polarity_batch([tweet["full_text"] for tweet in tweets])
+
+    return np.minimum(np.minimum(polarities, 1.0) * 100, 100.0)
+
+
+class FastSentimentAlgo(TwitterAlgorithm):
+    def define_algo() -> Algorithm:
+        """
+        Purpose:
+            Define the simple algo with the batched sentiment engine
+        Args:
+            N/A
+        Returns:
+            fast sentiment algo
+        """
+        # Make a tweet length function
+        tweet_length_func = Function(
+            "Tweet Length",
+            "Longer tweets are more important",
+            tweet_length,
+            batch_code=tweet_length_batch,
+            deterministic=True,
+        )
+
+        # Make a sentiment function, scores match TextBlob Sentiment
+        fast_sent_func = Function(
+            "Fast Sentiment",
+            "Postive tweets are higher",
+            fast_sent,
+            batch_code=fast_sent_batch,
+            deterministic=True,
+        )
+
+        weighted_func1 = WeightedFunction(1, tweet_length_func, "tweet_length")
+        weighted_func2 = WeightedFunction(1, fast_sent_func, "fast_sent")
+
+        fast_algo = Algorithm(
+            "Fast Sentiment Algo",
+            "Tweet Length and batched Sentiment",
+            [weighted_func1, weighted_func2],
+        )
+
+        return fast_algo
@@ -1,5 +1,6 @@
 import random
-from textblob import TextBlob
+
+import numpy as np
 
 from .algo_interface import TwitterAlgorithm
 from algo_builder.function import Function
@@ -26,6 +27,24 @@ def tweet_length(tweet):
     return float(char_lens / 2.8)
 
 
+def tweet_length_batch(tweets):
+    """
+    Purpose:
+        Batch version of tweet_length, scores all tweets in one array op
+    Args:
+        tweets: list of tweet data
+    Returns:
+        array of scores based on tweet length
+    """
+
+    char_lens = np.fromiter(
+        (len(tweet["full_text"]) for tweet in tweets), dtype=float, count=len(tweets)
+    )
+
+    # edge case if longer than 280 chars
+    return np.minimum(char_lens, 280) / 2.8
+
+
 def textblob_sent(tweet):
     """
     Purpose:
@@ -35,6 +54,9 @@ def textblob_sent(tweet):
     Returns:
         score based on sentiment
     """
+    # TextBlob is slow to import, only load it once a tweet is scored
+    from textblob import TextBlob
+
     analysis = TextBlob(tweet["full_text"])
     score = analysis.sentiment.polarity
 
@@ -62,12 +84,19 @@ class SimpleAlgo(TwitterAlgorithm):
         """
         # Make a tweet length function
         tweet_length_func = Function(
-            "Tweet Length", "Longer tweets are more important", tweet_length
+            "Tweet Length",
+            "Longer tweets are more important",
+            tweet_length,
+            batch_code=tweet_length_batch,
+            deterministic=True,
         )
 
         # Make a tweet length function
         text_blob_sent = Function(
-            "TextBlob Sentiment", "Postive tweets are higher", textblob_sent
+            "TextBlob Sentiment",
+            "Postive tweets are higher",
+            textblob_sent,
+            deterministic=True,
         )
 
         # Make three different weighted random functions
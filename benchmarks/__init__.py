@@ -0,0 +1,4 @@
+"""
+Purpose:
+    Benchmarks for the scoring pipeline, run with python -m benchmarks.bench_scoring
+"""
@@ -0,0 +1,158 @@
+"""
+Purpose:
+    Time the per tweet overhead of the scoring paths, with functions that do
+    almost no work, so the time left is the cost of the framework
+
+    python -m benchmarks.bench_compile
+    python -m benchmarks.bench_compile --num-functions 10 --num-tweets 20000
+"""
+
+# Python imports
+from typing import Any, Callable, Dict
+import argparse
+import logging
+import sys
+import time
+
+# project imports
+from algo_builder.algorithm import Algorithm
+from algo_builder.function import Function
+from algo_builder.weighted_function import WeightedFunction
+from benchmarks.synthetic import make_tweets
+
+
+def make_code(position: int) -> Callable:
+    """
+    Purpose:
+        Make a function that only reads the tweet
+    Args:
+        position: position of the function in the algo
+    Returns:
+        code: the function
+    """
+
+    def code(tweet):
+        return float(len(tweet["id_str"]) + position)
+
+    return code
+
+
+def make_algo(num_functions: int) -> Algorithm:
+    """
+    Purpose:
+        Make an algo of cheap functions
+    Args:
+        num_functions: number of weighted functions
+    Returns:
+        algo: the Algorithm
+    """
+    functions = [
+        WeightedFunction(
+            1 / (position + 1), Function(f"f{position}", "cheap", make_code(position))
+        )
+        for position in range(num_functions)
+    ]
+
+    return Algorithm("Overhead", "Cheap functions", functions)
+
+
+def best_time(run: Callable[[], Any], repeats: int) -> float:
+    """
+    Purpose:
+        Time a call
+    Args:
+        run: the call
+        repeats: number of runs, the best one is kept
+    Returns:
+        seconds of the best run
+    """
+    best = float("inf")
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def run(num_functions: int, num_tweets: int, repeats: int = 5) -> Dict[str, float]:
+    """
+    Purpose:
+        Time each scoring path on the same algo and tweets
+    Args:
+        num_functions: number of weighted functions
+        num_tweets: number of tweets
+        repeats: runs per path
+    Returns:
+        results: ns per tweet per function by path
+    """
+    algo = make_algo(num_functions)
+    compiled_algo = algo.compile()
+    tweets = make_tweets(num_tweets)
+    codes = [func.func.code for func in algo.functions]
+
+    def bare() -> None:
+        for tweet in tweets:
+            for code in codes:
+                code(tweet)
+
+    def run_algo() -> None:
+        for tweet in tweets:
+            algo.run_algo(tweet)
+
+    paths = {
+        "bare calls": bare,
+        "run_algo": run_algo,
+        "score_columns": lambda: algo.score_columns(tweets),
+        "compiled": lambda: compiled_algo.score_columns(tweets),
+    }
+
+    cells = num_functions * num_tweets
+
+    return {
+        name: best_time(path, repeats) / cells * 1e9 for name, path in paths.items()
+    }
+
+
+def print_results(results: Dict[str, float]) -> None:
+    """
+    Purpose:
+        Print the results as a table, overhead is the time over bare calls
+    Args:
+        results: ns per tweet per function by path
+    Returns:
+        N/A
+    """
+    bare = results["bare calls"]
+
+    print(f"{'path':<16}{'ns/cell':>10}{'overhead ns':>14}")
+
+    for name, value in results.items():
+        print(f"{name:<16}{value:>10.0f}{value - bare:>14.0f}")
+
+
+def main() -> int:
+    """
+    Purpose:
+        Run the benchmark from the command line
+    Args:
+        N/A
+    Returns:
+        exit code
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the compiled algo")
+    parser.add_argument("--num-functions", type=int, default=5)
+    parser.add_argument("--num-tweets", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print_results(run(args.num_functions, args.num_tweets, args.repeats))
+
+    return 0
+
+
+if __name__ == "__main__":
+    loglevel = logging.INFO
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=loglevel)
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Purpose:
+    Time the cold start of the scoring library, each case in a new python
+    process, and check the slow optional dependencies are not imported
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --budget 0.4 --repeats 5
+"""
+
+# Python imports
+from typing import Any, Dict, List
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code timed in a new process for each case
+CASES = {
+    "algorithm": "import algo_builder.algorithm",
+    "algos": "import algos\nalgos.Random_3_algo",
+    "load_algo": (
+        "from algo_builder.algorithm import load_algo\n"
+        "load_algo('saved_algos/Simple Algo.algo')"
+    ),
+}
+
+# Modules that should only be imported once they are used
+DEFERRED_MODULES = [
+    "pandas",
+    "textblob",
+    "requests",
+    "yellowbrick",
+    "sklearn",
+    "pyarrow",
+    "streamlit",
+]
+
+# Runs the case and prints the time and the deferred modules it imported
+TIMER_TEMPLATE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+imported = [name for name in {deferred!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "imported": imported}}))
+"""
+
+
+def time_case(code: str) -> Dict[str, Any]:
+    """
+    Purpose:
+        Time code in a new python process, so nothing is imported yet
+    Args:
+        code: the code to time
+    Returns:
+        result: seconds taken and the deferred modules imported
+    """
+    timer = TIMER_TEMPLATE.format(code=code, deferred=DEFERRED_MODULES)
+
+    output = subprocess.run(
+        [sys.executable, "-c", timer],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(case_names: List[str], repeats: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Purpose:
+        Time every case, keeping the best run
+    Args:
+        case_names: names of the cases in CASES
+        repeats: number of runs of each case
+    Returns:
+        results: seconds and deferred modules imported by case
+    """
+    results = {}
+
+    for name in case_names:
+        runs = [time_case(CASES[name]) for _ in range(repeats)]
+        results[name] = min(runs, key=lambda result: result["seconds"])
+
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, Any]], budget: float) -> None:
+    """
+    Purpose:
+        Print the results as a table
+    Args:
+        results: results from run
+        budget: most seconds a case may take
+    Returns:
+        N/A
+    """
+    print(f"{'case':<12}{'ms':>10}{'budget ms':>12}  imported")
+
+    for name, result in results.items():
+        imported = ", ".join(result["imported"]) or "-"
+        print(
+            f"{name:<12}{result['seconds'] * 1000:>10.1f}{budget * 1000:>12.0f}"
+            f"  {imported}"
+        )
+
+
+def main() -> int:
+    """
+    Purpose:
+        Run the benchmark from the command line
+    Args:
+        N/A
+    Returns:
+        exit code, 1 if a case is over budget or imports a deferred module
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the import time")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.4)
+    args = parser.parse_args()
+
+    results = run(args.cases, args.repeats)
+    print_results(results, args.budget)
+
+    failures = []
+    for name, result in results.items():
+        if result["seconds"] > args.budget:
+            failures.append(f"{name} took {result['seconds']:.3f}s")
+        if result["imported"]:
+            failures.append(f"{name} imported {', '.join(result['imported'])}")
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+
+    if failures:
+        return 1
+
+    print("Within budget")
+
+    return 0
+
+
+if __name__ == "__main__":
+    loglevel = logging.INFO
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=loglevel)
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Purpose:
+    Time the scoring pipeline on synthetic tweets, and compare with baselines
+
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --save-baseline
+    python -m benchmarks.bench_scoring --compare
+"""
+
+# Python imports
+from typing import Any, Dict, List
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# 3rd party imports
+import numpy as np
+
+# project imports
+import algos
+import algo_builder.utils as utils
+from algo_builder.sentiment import get_engine
+from benchmarks.synthetic import make_tweets
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+ALGOS = {
+    "SimpleAlgo": algos.SimpleAlgo,
+    "Random_3_algo": algos.Random_3_algo,
+    "FastSentimentAlgo": algos.FastSentimentAlgo,
+}
+
+# Metrics checked against the baseline, and if higher is better
+CHECKED_METRICS = {
+    "tweets_per_sec": True,
+    "p99_ms": False,
+    "peak_mem_kb": False,
+}
+
+
+def clear_caches(algo) -> None:
+    """
+    Purpose:
+        Clear the algo's result cache and the shared sentiment cache, so the
+        functions are timed and not the caches
+    Args:
+        algo: the Algorithm
+    Returns:
+        N/A
+    """
+    algo.get_cache().clear()
+    get_engine().cache.clear()
+
+
+def time_throughput(algo, tweets: List[Dict[str, Any]], repeats: int) -> float:
+    """
+    Purpose:
+        Time process_tweets on the whole batch
+    Args:
+        algo: the Algorithm
+        tweets: the batch of tweets
+        repeats: number of runs, the best one is kept
+    Returns:
+        tweets_per_sec: throughput of the best run
+    """
+    best = float("inf")
+
+    for _ in range(repeats):
+        clear_caches(algo)
+
+        start = time.perf_counter()
+        algo.process_tweets(tweets)
+        best = min(best, time.perf_counter() - start)
+
+    return len(tweets) / best
+
+
+def time_per_tweet(algo, tweets: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Purpose:
+        Time scoring each tweet on its own
+    Args:
+        algo: the Algorithm
+        tweets: the tweets
+    Returns:
+        latencies: seconds per tweet
+    """
+    clear_caches(algo)
+    latencies = np.empty(len(tweets))
+
+    for index, tweet in enumerate(tweets):
+        start = time.perf_counter()
+        algo.score_columns([tweet])
+        latencies[index] = time.perf_counter() - start
+
+    return latencies
+
+
+def peak_memory(algo, tweets: List[Dict[str, Any]]) -> float:
+    """
+    Purpose:
+        Measure the peak memory allocated by process_tweets
+    Args:
+        algo: the Algorithm
+        tweets: the batch of tweets
+    Returns:
+        peak_kb: peak traced memory in KB
+    """
+    clear_caches(algo)
+
+    tracemalloc.start()
+    algo.process_tweets(tweets)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 1024
+
+
+def run(
+    batch_sizes: List[int], algo_names: List[str], repeats: int = 3
+) -> Dict[str, Dict[str, float]]:
+    """
+    Purpose:
+        Run the benchmark for every algo and batch size
+    Args:
+        batch_sizes: number of tweets per batch
+        algo_names: names of the algos in ALGOS
+        repeats: runs per throughput measurement
+    Returns:
+        results: metrics per "algo/batch_size"
+    """
+    results = {}
+    tweets = make_tweets(max(batch_sizes))
+
+    for algo_name in algo_names:
+        algo = ALGOS[algo_name].define_algo()
+
+        for batch_size in batch_sizes:
+            random.seed(0)
+            batch = tweets[:batch_size]
+
+            latencies = time_per_tweet(algo, batch[:200])
+
+            results[f"{algo_name}/{batch_size}"] = {
+                "tweets_per_sec": time_throughput(algo, batch, repeats),
+                "p50_ms": float(np.percentile(latencies, 50) * 1000),
+                "p99_ms": float(np.percentile(latencies, 99) * 1000),
+                "peak_mem_kb": peak_memory(algo, batch),
+            }
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baselines: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Purpose:
+        Find metrics that got worse than the baseline by more than the tolerance
+    Args:
+        results: metrics from run
+        baselines: saved metrics
+        tolerance: allowed relative change, 0.3 is 30%
+    Returns:
+        regressions: a message per regression
+    """
+    regressions = []
+
+    for key, metrics in results.items():
+        if key not in baselines:
+            continue
+
+        for metric, higher_is_better in CHECKED_METRICS.items():
+            value = metrics[metric]
+            baseline = baselines[key][metric]
+
+            if higher_is_better:
+                worse = value < baseline * (1 - tolerance)
+            else:
+                worse = value > baseline * (1 + tolerance)
+
+            if worse:
+                regressions.append(
+                    f"{key} {metric}: {value:.3f} vs baseline {baseline:.3f}"
+                )
+
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    """
+    Purpose:
+        Print the results as a table
+    Args:
+        results: metrics from run
+    Returns:
+        N/A
+    """
+    print(f"{'benchmark':<24}{'tweets/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>12}")
+
+    for key, metrics in results.items():
+        print(
+            f"{key:<24}{metrics['tweets_per_sec']:>12.0f}{metrics['p50_ms']:>10.3f}"
+            f"{metrics['p99_ms']:>10.3f}{metrics['peak_mem_kb']:>12.0f}"
+        )
+
+
+def main() -> int:
+    """
+    Purpose:
+        Run the benchmark from the command line
+    Args:
+        N/A
+    Returns:
+        exit code, 1 if a comparison found regressions
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the scoring pipeline")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--algos", nargs="+", default=list(ALGOS), choices=list(ALGOS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    results = run(args.batch_sizes, args.algos, args.repeats)
+    print_results(results)
+
+    if args.save_baseline:
+        utils.save_json(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+
+    if args.compare:
+        regressions = compare(results, utils.load_json(args.baseline), args.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        if regressions:
+            return 1
+
+        print("No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    loglevel = logging.INFO
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=loglevel)
+    sys.exit(main())
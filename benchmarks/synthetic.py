@@ -0,0 +1,88 @@
+"""
+Purpose:
+    Deterministic synthetic tweets shaped like the python-twitter _json dicts
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+import random
+
+WORDS = [
+    "good", "bad", "great", "terrible", "happy", "sad", "love", "hate", "the",
+    "a", "is", "this", "not", "very", "new", "today", "python", "twitter",
+    "algorithm", "open", "source", "release", "awesome", "boring", "why", "how",
+]
+
+SCREEN_NAMES = [f"user{index}" for index in range(50)]
+
+# Oldest tweet time, tweets get newer as the index grows
+START_TIME = datetime(2022, 3, 24, tzinfo=timezone.utc)
+
+FIRST_ID = 1507041396242407424
+
+
+def make_tweet(index: int, rng: random.Random) -> Dict[str, Any]:
+    """
+    Purpose:
+        Make one synthetic tweet
+    Args:
+        index: position of the tweet, sets its id and time
+        rng: random generator
+    Returns:
+        tweet: tweet JSON with a twitter_url
+    """
+    id_str = str(FIRST_ID + index)
+    screen_name = rng.choice(SCREEN_NAMES)
+
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 50))]
+    hashtags = [word for word in words if rng.random() < 0.05]
+    full_text = " ".join(words + [f"#{tag}" for tag in hashtags])[:280]
+
+    created_at = START_TIME + timedelta(seconds=37 * index)
+
+    return {
+        "created_at": created_at.strftime("%a %b %d %H:%M:%S %z %Y"),
+        "id": int(id_str),
+        "id_str": id_str,
+        "full_text": full_text,
+        "truncated": False,
+        "display_text_range": [0, len(full_text)],
+        "entities": {
+            "hashtags": [{"text": tag} for tag in hashtags],
+            "symbols": [],
+            "user_mentions": [],
+            "urls": [],
+        },
+        "user": {
+            "id": SCREEN_NAMES.index(screen_name),
+            "id_str": str(SCREEN_NAMES.index(screen_name)),
+            "name": screen_name.title(),
+            "screen_name": screen_name,
+            "followers_count": rng.randint(0, 100000),
+            "friends_count": rng.randint(0, 5000),
+            "verified": rng.random() < 0.1,
+        },
+        "is_quote_status": False,
+        "retweet_count": rng.randint(0, 500),
+        "favorite_count": rng.randint(0, 2000),
+        "favorited": False,
+        "retweeted": False,
+        "lang": "en",
+        "twitter_url": f"https://twitter.com/{screen_name}/status/{id_str}",
+    }
+
+
+def make_tweets(num_tweets: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Purpose:
+        Make a list of synthetic tweets, the same for the same seed
+    Args:
+        num_tweets: number of tweets
+        seed: random seed
+    Returns:
+        tweets: list of tweet JSON, newest first like the home timeline
+    """
+    rng = random.Random(seed)
+    tweets = [make_tweet(index, rng) for index in range(num_tweets)]
+    tweets.reverse()
+    return tweets
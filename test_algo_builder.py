@@ -1,62 +1,103 @@
 # Python imports
 import logging
 import os
-from typing import Dict, Any, List
-
-# 3rd party imports
-import twitter
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Union
 
 # project imports
 import algos
+from algo_builder.tweet import TweetBatch
+from algo_builder.tweet_store import TweetStore
+
+if TYPE_CHECKING:
+    from algo_builder.fetcher import TimelineFetcher
 
 
-CONSUMER_KEY = os.environ["CONSUMER_KEY"]
-CONSUMER_SECRET = os.environ["CONSUMER_SECRET"]
-ACCESS_TOKEN_KEY = os.environ["ACCESS_TOKEN_KEY"]
-ACCESS_TOKEN_SECRET = os.environ["ACCESS_TOKEN_SECRET"]
+# One fetcher for the whole process, so the HTTP session is reused
+_fetcher = None
 
+# Open tweet stores by path
+_stores = {}
 
-def get_home_timeline(num_tweets: int = 20) -> List[Dict[str, Any]]:
+
+def get_credentials() -> Tuple[str, str, str, str]:
     """
     Purpose:
-        Get tweets from your timeline
+        Read the Twitter API credentials from the environment, only when
+        tweets are fetched so importing this file does not need them
     Args:
-        num_tweets: number of twetts
+        N/A
     Returns:
-        tweets from timeline
+        (consumer key, consumer secret, access token key, access token secret)
     """
-    twitter_api = twitter.Api(
-        consumer_key=CONSUMER_KEY,
-        consumer_secret=CONSUMER_SECRET,
-        access_token_key=ACCESS_TOKEN_KEY,
-        access_token_secret=ACCESS_TOKEN_SECRET,
-        tweet_mode="extended",
+    return (
+        os.environ["CONSUMER_KEY"],
+        os.environ["CONSUMER_SECRET"],
+        os.environ["ACCESS_TOKEN_KEY"],
+        os.environ["ACCESS_TOKEN_SECRET"],
     )
 
-    timeline_tweets = twitter_api.GetHomeTimeline(
-        count=num_tweets, contributor_details=True
-    )
-    # home_timeline = [i.full_text for i in timeline_tweets]
 
-    # Create tweet url_field
+def get_fetcher() -> "TimelineFetcher":
+    """
+    Purpose:
+        Get the shared timeline fetcher
+    Args:
+        N/A
+    Returns:
+        fetcher: TimelineFetcher with a pooled session
+    """
+    global _fetcher
 
-    twitter_json_list = []
+    if _fetcher is None:
+        # requests is only imported once tweets are fetched
+        from algo_builder.fetcher import TimelineFetcher, make_oauth
 
-    for tweet in timeline_tweets:
+        auth = make_oauth(*get_credentials())
+        _fetcher = TimelineFetcher(auth=auth)
 
-        username = tweet.user.screen_name  # Username vlaue
-        id_str = tweet.id_str  # id str
+    return _fetcher
 
-        curr_tweet = tweet._json  # JSON object
 
-        # Get the twitter url
-        curr_tweet["twitter_url"] = f"https://twitter.com/{username}/status/{id_str}"
+def get_home_timeline(
+    num_tweets: int = 20, compact: bool = False
+) -> Union[List[Dict[str, Any]], TweetBatch]:
+    """
+    Purpose:
+        Get tweets from your timeline, across as many pages as needed
+    Args:
+        num_tweets: number of twetts
+        compact: return a columnar TweetBatch instead of the full JSON dicts
+    Returns:
+        tweets from timeline
+    """
+
+    timeline_tweets = get_fetcher().iter_tweets(num_tweets)
+
+    if compact:
+        # Only keep the fields the algorithms read
+        return TweetBatch.from_json(timeline_tweets)
+
+    return list(timeline_tweets)
+
 
-        # Add the json to list
-        twitter_json_list.append(curr_tweet)
+def sync_home_timeline(
+    num_tweets: int = 20, store_path: str = "tweet_store.db"
+) -> List[Dict[str, Any]]:
+    """
+    Purpose:
+        Get tweets from your timeline, only fetching tweets newer than the
+        ones already in the local store
+    Args:
+        num_tweets: number of twetts
+        store_path: path of the local tweet store
+    Returns:
+        tweets from timeline
+    """
 
-    return twitter_json_list
+    if store_path not in _stores:
+        _stores[store_path] = TweetStore(store_path)
 
+    return _stores[store_path].sync(get_fetcher(), num_tweets)
 
 
 def main():